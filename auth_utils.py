@@ -2,25 +2,93 @@ from typing import Union, Dict
 import hmac
 import hashlib
 from typing import Dict
-from urllib.parse import urlencode, urlparse
+from urllib.parse import urlencode
 from settings import SECRET_KEY
 
+# Encode the shared secret once instead of on every sign/verify call
+_SECRET_BYTES = SECRET_KEY.encode()
 
-def generate_hmac(url: str, secret_key: str = SECRET_KEY) -> str:
+# Passing the digest by *name* lets hmac.digest() dispatch straight to OpenSSL's
+# one-shot HMAC(), which uses the SHA-NI instructions on CPUs that have them.
+# This needs a Python built against OpenSSL >= 1.1.1; without it hmac falls
+# back to the slower pure-Python HMAC construction.
+_HMAC_DIGEST = "sha256"
+try:
+    import _hashlib
+
+    HMAC_USES_OPENSSL = _HMAC_DIGEST in _hashlib.openssl_md_meth_names
+except (ImportError, AttributeError):
+    HMAC_USES_OPENSSL = False
+
+if not HMAC_USES_OPENSSL or _HMAC_DIGEST not in hashlib.algorithms_available:
+    print(
+        "[WARNING] OpenSSL-backed SHA-256 is unavailable; HMAC signing will use "
+        "the slower pure-Python fallback."
+    )
+
+
+# Keyed HMAC state for the shared secret; copying it skips re-deriving the
+# inner/outer key pads on every call
+_HMAC_TEMPLATE = hmac.new(_SECRET_BYTES, b"", _HMAC_DIGEST)
+
+
+def _key_bytes(secret_key: Union[str, bytes]) -> bytes:
+    return secret_key if isinstance(secret_key, bytes) else secret_key.encode()
+
+
+def _hmac_digest(key: bytes, message: bytes) -> bytes:
+    if key == _SECRET_BYTES:
+        mac = _HMAC_TEMPLATE.copy()
+        mac.update(message)
+        return mac.digest()
+    return hmac.digest(key, message, _HMAC_DIGEST)
+
+
+def _split_path_query(url: str):
+    """
+    Split a URL into (path, query) without the cost of a full urlparse().
+
+    The scheme, host and fragment are dropped; they are never part of the
+    signed message.
+    """
+    url = url.partition("#")[0]
+    path, _, query = url.partition("?")
+    scheme_end = path.find("://")
+    if scheme_end != -1:
+        path_start = path.find("/", scheme_end + 3)
+        path = path[path_start:] if path_start != -1 else ""
+    return path, query
+
+
+def generate_hmac_raw(
+    message: str, secret_key: Union[str, bytes] = _SECRET_BYTES
+) -> str:
+    """
+    Generate an HMAC signature for an already canonical path + query message.
+
+    Args:
+        message (str): The message to sign, e.g. "/tool_data?timestamp=...".
+        secret_key (str | bytes): The shared secret key.
+
+    Returns:
+        str: The generated HMAC signature.
+    """
+    return _hmac_digest(_key_bytes(secret_key), message.encode()).hex()
+
+
+def generate_hmac(url: str, secret_key: Union[str, bytes] = _SECRET_BYTES) -> str:
     """
     Generate an HMAC signature for the complete URL.
 
     Args:
         url (str): The full URL including query parameters.
-        secret_key (str): The shared secret key.
+        secret_key (str | bytes): The shared secret key.
 
     Returns:
         str: The generated HMAC signature.
     """
     # Use the full URL (path + query string) as the message
-    parsed_url = urlparse(url)
-    path = parsed_url.path
-    query = parsed_url.query
+    path, query = _split_path_query(url)
 
     # Combine path and query without adding extra `?`
     if query:
@@ -28,16 +96,11 @@ def generate_hmac(url: str, secret_key: str = SECRET_KEY) -> str:
     else:
         message = path  # No query parameters
 
-    # Generate the HMAC signature
-    signature = hmac.new(
-        secret_key.encode(), message.encode(), hashlib.sha256
-    ).hexdigest()
-
-    return signature
+    return generate_hmac_raw(message, secret_key)
 
 
 def verify_hmac(
-    url: str, provided_signature: str, secret_key: str = SECRET_KEY
+    url: str, provided_signature: str, secret_key: Union[str, bytes] = _SECRET_BYTES
 ) -> bool:
     """
     Verify an HMAC signature for the complete URL.
@@ -45,18 +108,16 @@ def verify_hmac(
     Args:
         url (str): The full URL including query parameters.
         provided_signature (str): The HMAC signature to verify.
-        secret_key (str): The shared secret key.
+        secret_key (str | bytes): The shared secret key.
 
     Returns:
         bool: True if the signature is valid, False otherwise.
     """
     # Use the full URL (path + query string) as the message
-    parsed_url = urlparse(url)
-    message = f"{parsed_url.path}?{parsed_url.query}"
+    path, query = _split_path_query(url)
+    message = f"{path}?{query}"
 
     # Generate the expected HMAC signature
-    expected_signature = hmac.new(
-        secret_key.encode(), message.encode(), hashlib.sha256
-    ).hexdigest()
+    expected_signature = _hmac_digest(_key_bytes(secret_key), message.encode()).hex()
 
     return hmac.compare_digest(expected_signature, provided_signature)
@@ -2,22 +2,51 @@ from sqlalchemy import (
     create_engine,
     Column,
     Integer,
+    BigInteger,
     String,
     Float,
     Text,
     ForeignKey,
     cast,
+    event,
+    or_,
 )
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
-from sqlalchemy import text, select
+from sqlalchemy.pool import QueuePool
+from sqlalchemy import text, select, bindparam, inspect
 from settings import load_config
-from datetime import datetime
-import uuid
-from auth_utils import generate_hmac
+import os
+import time
+from auth_utils import generate_hmac_raw
 from settings import CONFIG  # For configuration settings
 import requests
 import re
-from urllib.parse import urlencode
+from functools import lru_cache
+from urllib.parse import quote_plus, urlparse
+
+# Numeric portion of a field value, e.g. "-1", "12.34", ".125"
+_NUMERIC_RE = re.compile(r"-?(?:\d+(?:\.\d*)?|\.\d+)")
+
+# orjson is optional; it is several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    import json
+
+    orjson = None
+
+
+def _json_dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(content):
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 # Define SQLAlchemy Base and Tool Model
 Base = declarative_base()
@@ -54,6 +83,9 @@ class Tool(Base):
     ShapeAttribute = Column(Text)
     Units = Column(Text)  # Imperial or Metric - for FreeCAD v1.2+
 
+    # Internal: character fingerprint of the searchable text, see name_fingerprint()
+    name_fp = Column(BigInteger)
+
 
 class ToolModel(Base):
     __tablename__ = "tool"
@@ -151,8 +183,255 @@ def get_database_url():
 # Initialize the database engine and session
 DATABASE_URL = get_database_url()
 HMAC_ENABLED = CONFIG.get("api", {}).get("hmac_enabled", False)
-engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+if DATABASE_URL.startswith("sqlite"):
+    # Connections may be used from the API server's worker threads
+    ENGINE_OPTIONS = {"connect_args": {"check_same_thread": False}}
+    if ":memory:" not in DATABASE_URL:
+        # File databases default to NullPool, which reopens the file (and
+        # discards its page cache and mmap) for every session
+        ENGINE_OPTIONS.update(poolclass=QueuePool, pool_size=5, max_overflow=10)
+else:
+    # Recycle connections ahead of the server's idle timeout instead of
+    # issuing a pre-ping SELECT 1 on every checkout
+    ENGINE_OPTIONS = {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800}
+# Room in the compiled-statement cache for every prebuilt query in this module
+engine = create_engine(
+    DATABASE_URL, echo=False, query_cache_size=1200, **ENGINE_OPTIONS
+)
 Session = sessionmaker(bind=engine)
+DB_DIALECT = engine.dialect.name
+
+# Bookkeeping columns that are never returned to callers
+INTERNAL_COLUMNS = frozenset({"name_fp"})
+
+# Column names of the tools table, in declaration order
+TOOL_COLUMNS = tuple(
+    column for column in Tool.__table__.columns.keys() if column not in INTERNAL_COLUMNS
+)
+TOOL_SELECT_COLUMNS = tuple(Tool.__table__.c[column] for column in TOOL_COLUMNS)
+
+# Shared HTTP session for API mode: keeps connections alive between requests
+# instead of paying a new TCP/TLS handshake per call
+API_SESSION = requests.Session()
+API_SESSION.headers.update({"Content-Type": "application/json"})
+_api_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=10, pool_maxsize=20, max_retries=3
+)
+API_SESSION.mount("http://", _api_adapter)
+API_SESSION.mount("https://", _api_adapter)
+
+
+if DB_DIALECT == "sqlite":
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        WAL journaling with synchronous=NORMAL: commits append to the log and
+        only checkpoints fsync, while staying crash safe. Reads go through a
+        256 MiB memory map and a 64 MiB page cache per pooled connection.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
+
+# Text columns covered by the SQLite full-text index used by fetch_filtered()
+FTS_COLUMNS = ("ToolName", "ToolType", "ManufacturerName", "Shape", "PartNumber")
+FTS_ENABLED = False
+
+
+def name_fingerprint(*values):
+    """
+    63-bit character fingerprint of a tool's searchable text.
+
+    Bit (code point % 63) is set for every character, with ASCII letters folded
+    to lower case the way SQLite's LIKE folds them. A row can only LIKE-match a
+    keyword if its fingerprint contains every bit of the keyword's fingerprint,
+    so fetch_filtered() can discard most rows with one integer AND.
+
+    Args:
+        *values: Column values; None is skipped.
+
+    Returns:
+        int: The fingerprint (fits a signed 64-bit column).
+    """
+    fingerprint = 0
+    for value in values:
+        if not value:
+            continue
+        for char in str(value):
+            code = ord(char)
+            if 65 <= code <= 90:  # A-Z
+                code += 32
+            fingerprint |= 1 << (code % 63)
+    return fingerprint
+
+
+def ensure_name_fingerprints():
+    """
+    Add the `name_fp` column to an existing `tools` table and fill it in for
+    rows that do not have a fingerprint yet.
+    """
+    tools = Tool.__table__
+    try:
+        with engine.begin() as connection:
+            columns = inspect(connection).get_columns("tools")
+            if "name_fp" not in {column["name"] for column in columns}:
+                connection.execute(text("ALTER TABLE tools ADD COLUMN name_fp BIGINT"))
+
+            rows = connection.execute(
+                select(tools.c.ToolNumber, *(tools.c[column] for column in FTS_COLUMNS))
+                .where(tools.c.name_fp.is_(None))
+            ).all()
+            if rows:
+                connection.execute(
+                    tools.update()
+                    .where(tools.c.ToolNumber == bindparam("tool_number"))
+                    .values(name_fp=bindparam("fingerprint")),
+                    [
+                        {
+                            "tool_number": row[0],
+                            "fingerprint": name_fingerprint(*row[1:]),
+                        }
+                        for row in rows
+                    ],
+                )
+    except Exception as e:
+        print(f"[WARNING] Could not update search fingerprints: {e}")
+
+
+def ensure_search_index():
+    """
+    Create the search indexes that back fetch_filtered(), if missing.
+
+    On SQLite, `tools_fts` is an external-content trigram index kept in sync
+    with `tools` by triggers, so substring searches of three or more characters
+    become an index lookup instead of a LIKE scan over every row. The trigram
+    tokenizer needs SQLite 3.34+; on older builds fetch_filtered() keeps using
+    LIKE. On PostgreSQL, pg_trgm GIN indexes serve the same ILIKE searches.
+    On MySQL, B-tree prefix indexes serve `keyword%` searches.
+    """
+    global FTS_ENABLED
+    ensure_name_fingerprints()
+    ensure_prefix_indexes()
+
+    if DB_DIALECT == "postgresql":
+        ensure_trigram_indexes()
+        return
+    if DB_DIALECT != "sqlite":
+        return
+
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+    fts_insert = (
+        f"INSERT INTO tools_fts(rowid, {columns})"
+        f" VALUES (new.ToolNumber, {new_values});"
+    )
+    fts_delete = (
+        f"INSERT INTO tools_fts(tools_fts, rowid, {columns})"
+        f" VALUES ('delete', old.ToolNumber, {old_values});"
+    )
+
+    try:
+        with engine.begin() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'tools_fts'")
+            ).first()
+            connection.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS tools_fts USING fts5({columns},"
+                    " content='tools', content_rowid='ToolNumber', tokenize='trigram')"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE TRIGGER IF NOT EXISTS tools_fts_ai AFTER INSERT ON tools"
+                    f" BEGIN {fts_insert} END"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE TRIGGER IF NOT EXISTS tools_fts_ad AFTER DELETE ON tools"
+                    f" BEGIN {fts_delete} END"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE TRIGGER IF NOT EXISTS tools_fts_au AFTER UPDATE ON tools"
+                    f" BEGIN {fts_delete} {fts_insert} END"
+                )
+            )
+            if not exists:
+                # Index the rows that are already in the table
+                connection.execute(
+                    text("INSERT INTO tools_fts(tools_fts) VALUES ('rebuild')")
+                )
+        FTS_ENABLED = True
+    except Exception as e:
+        print(f"[WARNING] Full-text search index unavailable, using LIKE: {e}")
+
+
+# B-tree indexes for prefix searches ("keyword%") in fetch_filtered(). Only
+# MySQL can use them: SQLite's LIKE and the ILIKE used on PostgreSQL are
+# case-insensitive, which a plain B-tree cannot serve
+PREFIX_INDEXES = {
+    "ix_tool_name_pat": "ToolName",
+    "ix_tool_type_pat": "ToolType",
+    "ix_tool_mfr_pat": "ManufacturerName",
+}
+
+
+def ensure_prefix_indexes():
+    """
+    Create the B-tree prefix indexes on MySQL, and drop them elsewhere.
+
+    MySQL can only index a prefix of a TEXT column, so the first 255
+    characters are indexed. On other databases the indexes would add write
+    cost without serving any search, so copies left by earlier versions are
+    removed.
+    """
+    try:
+        if DB_DIALECT == "mysql":
+            existing = {index["name"] for index in inspect(engine).get_indexes("tools")}
+            with engine.begin() as connection:
+                for name, column in PREFIX_INDEXES.items():
+                    if name not in existing:
+                        connection.execute(
+                            text(f"CREATE INDEX {name} ON tools ({column}(255))")
+                        )
+        else:
+            with engine.begin() as connection:
+                for name in PREFIX_INDEXES:
+                    connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    except Exception as e:
+        print(f"[WARNING] Could not update tool prefix indexes: {e}")
+
+
+def ensure_trigram_indexes():
+    """
+    Create pg_trgm GIN indexes on the searchable columns of `tools` (PostgreSQL).
+
+    The planner uses them for both `%keyword%` and `keyword%` ILIKE patterns.
+    Creating the extension needs sufficient privileges; without it searches
+    still work, as sequential scans.
+    """
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for column in FTS_COLUMNS:
+                connection.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS tools_{column.lower()}_trgm"
+                        f' ON tools USING gin ("{column}" gin_trgm_ops)'
+                    )
+                )
+    except Exception as e:
+        print(f"[WARNING] Trigram search indexes unavailable: {e}")
 
 
 def set_db_mode(mode, api_url=None):
@@ -162,15 +441,21 @@ def set_db_mode(mode, api_url=None):
     :param mode: 'direct' or 'api'
     :param api_url: Base URL for API requests (if mode is 'api')
     """
-    global DB_MODE, API_URL
+    global DB_MODE, API_URL, API_PATH
     DB_MODE = mode
     API_URL = api_url
+    # Cached shapes may have come from the previous backend
+    fetch_shapes.invalidate()
+    # Path prefix of the API base URL; parsed once so request signing only
+    # has to join strings
+    API_PATH = urlparse(api_url).path.rstrip("/") if api_url else ""
 
     if mode == "direct":
         # Test SQL connection
         try:
             # Ensure tables are created
             Base.metadata.create_all(engine)
+            ensure_search_index()
             with Session() as session:
                 session.execute("SELECT 1")  # Simple query to test the connection
                 print("[INFO] Database connection successful.")
@@ -183,7 +468,7 @@ def set_db_mode(mode, api_url=None):
                 )
 
 
-def make_api_request(method, endpoint, data=None):
+def make_api_request(method, endpoint, data=None, stream=False):
     """
     Helper function to make API requests with optional HMAC signing.
 
@@ -191,6 +476,7 @@ def make_api_request(method, endpoint, data=None):
         method (str): HTTP method (GET, POST, PUT, DELETE).
         endpoint (str): API endpoint path (e.g., '/tools').
         data (dict, optional): Payload for POST/PUT requests or query parameters for GET.
+        stream (bool, optional): Read a large GET response body in 64 KiB chunks.
 
     Returns:
         dict: The response from the API as a JSON object.
@@ -200,34 +486,48 @@ def make_api_request(method, endpoint, data=None):
 
     # Construct the full URL
     url = f"{API_URL}{endpoint}"  # Full URL including path
-    headers = {"Content-Type": "application/json"}
-    signed_data = data.copy() if data else {}
-
     if HMAC_ENABLED:
         # Add HMAC-related fields
-        signed_data["timestamp"] = datetime.utcnow().isoformat()
-        signed_data["nonce"] = str(uuid.uuid4())
+        signed_data = {
+            **(data or {}),
+            "timestamp": time.time_ns(),
+            "nonce": os.urandom(16).hex(),
+        }
 
-        # Serialize query parameters into the URL for HMAC generation
-        query_string = urlencode(signed_data)
-        separator = "&" if "?" in url else "?"
-        full_url = f"{url}{separator}{query_string}"
+        # Canonical query string, byte-for-byte what urlencode() produces. Keep
+        # insertion order: the server rebuilds the message in request order.
+        query_string = "&".join(
+            f"{quote_plus(str(key))}={quote_plus(str(value))}"
+            for key, value in signed_data.items()
+        )
 
-        # Generate the signature
-        signed_data["signature"] = generate_hmac(full_url)
+        # Sign path + query directly (the server verifies against the request path)
+        separator = "&" if "?" in endpoint else "?"
+        signed_data["signature"] = generate_hmac_raw(
+            f"{API_PATH}{endpoint}{separator}{query_string}"
+        )
+    else:
+        signed_data = data.copy() if data else {}
 
     try:
-        if method == "GET":
+        if method == "GET" and stream:
+            # Large listings: pull the body in big chunks and parse it once
+            with API_SESSION.get(url, params=signed_data, stream=True) as response:
+                response.raise_for_status()
+                return _json_loads(b"".join(response.iter_content(65536)))
+        elif method == "GET":
             # Send data as query parameters
-            response = requests.get(url, params=signed_data, headers=headers)
+            response = API_SESSION.get(url, params=signed_data)
         elif method in ("POST", "PUT", "DELETE"):
-            # Send data as JSON payload
-            response = requests.request(method, url, json=signed_data, headers=headers)
+            # Send data as a pre-encoded JSON payload
+            response = API_SESSION.request(
+                method, url, data=_json_dumps(signed_data)
+            )
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"API request failed: {e}")
 
@@ -247,18 +547,29 @@ def fetch_column_names(table_name):
         response = make_api_request("GET", f"/column_names/{table_name}")
         return response.get("column_names", [])  # Extract the list of column names
 
-    with Session() as session:
-        # Detect the database backend
-        backend = session.bind.dialect.name
+    return list(_fetch_column_names(table_name))
 
-        if backend == "sqlite":
+
+@lru_cache(maxsize=32)
+def _fetch_column_names(table_name):
+    """
+    Column names of a table, read from the database once and then cached.
+    Internal bookkeeping columns are left out.
+
+    The engine (and so the backend and schema) is fixed at import time, so the
+    table name alone is a sufficient cache key.
+    """
+    with Session() as session:
+        if DB_DIALECT == "sqlite":
             # SQLite query
             result = session.execute(
                 text(f"PRAGMA table_info({table_name});")
             ).fetchall()
-            return [row["name"] for row in result]
+            return tuple(
+                row["name"] for row in result if row["name"] not in INTERNAL_COLUMNS
+            )
 
-        elif backend in ("mysql", "mariadb"):
+        elif DB_DIALECT in ("mysql", "mariadb"):
             # MariaDB/MySQL query
             schema_name = session.bind.url.database
             result = session.execute(
@@ -271,10 +582,15 @@ def fetch_column_names(table_name):
                 ),
                 {"schema_name": schema_name, "table_name": table_name},
             ).fetchall()
-            return [row[0] for row in result]
+            return tuple(row[0] for row in result if row[0] not in INTERNAL_COLUMNS)
 
         else:
-            raise ValueError(f"Unsupported database backend: {backend}")
+            raise ValueError(f"Unsupported database backend: {DB_DIALECT}")
+
+
+# Schemas only change through migrations; let those invalidate the cache with
+# fetch_column_names.cache_clear()
+fetch_column_names.cache_clear = _fetch_column_names.cache_clear
 
 
 def fetch_tool_data(tool_number=None):
@@ -291,7 +607,8 @@ def fetch_tool_data(tool_number=None):
         endpoint = f"/tool_data"
         if tool_number:
             endpoint += f"?tool_number={tool_number}"
-        response = make_api_request("GET", endpoint)
+        # The unfiltered listing can be large; stream it
+        response = make_api_request("GET", endpoint, stream=not tool_number)
 
         # Ensure response includes both 'tools' and 'columns'
         if (
@@ -304,29 +621,49 @@ def fetch_tool_data(tool_number=None):
         return response["tools"], response["columns"]
 
     with Session() as session:
-        query = select(Tool)
+        # Core select on the table columns: plain rows, no ORM instances
+        query = select(*TOOL_SELECT_COLUMNS)
         if tool_number is not None:
-            query = query.filter(Tool.ToolNumber == tool_number)
+            query = query.where(Tool.ToolNumber == tool_number)
+
+        rows = session.execute(query).mappings().all()
+        return [dict(row) for row in rows], list(TOOL_COLUMNS)
 
-        # Execute the query and fetch results
-        tools = session.execute(query).scalars().all()
-        columns = Tool.__table__.columns.keys()
 
-        # Convert ORM objects to dictionaries and remove internal attributes
-        rows_as_dicts = []
-        for tool in tools:
-            tool_dict = {key: getattr(tool, key) for key in columns}
-            rows_as_dicts.append(tool_dict)
+def iter_tool_data(batch_size=500):
+    """
+    Stream every tool row from the database, or via API.
 
-        return rows_as_dicts, list(columns)
+    Rows come from a server-side cursor in batches, so full-table exports hold
+    one batch in memory instead of the whole table plus a copy of it.
 
+    Args:
+        batch_size (int, optional): Number of rows fetched per round trip.
 
-def fetch_filtered(keyword):
+    Yields:
+        dict: One tool row, keyed by column name.
+    """
+    if DB_MODE == "api":
+        yield from fetch_tool_data()[0]
+        return
+
+    with Session() as session:
+        query = select(*TOOL_SELECT_COLUMNS).execution_options(stream_results=True)
+        for row in session.execute(query).yield_per(batch_size).mappings():
+            yield dict(row)
+
+
+_LIKE_WILDCARDS = frozenset("%_")
+
+
+def fetch_filtered(keyword, prefix=False):
     """
     Fetch tools filtered by a keyword from the database or via API.
 
     Args:
         keyword (str): The keyword to filter tools by.
+        prefix (bool, optional): Match only values that start with the keyword
+                                 instead of values that contain it.
 
     Returns:
         tuple: A tuple containing:
@@ -334,7 +671,10 @@ def fetch_filtered(keyword):
             - List[str]: Column names corresponding to the data.
     """
     if DB_MODE == "api":
-        response = make_api_request("GET", f"/filtered", data={"keyword": keyword})
+        params = {"keyword": keyword}
+        if prefix:
+            params["prefix"] = "true"
+        response = make_api_request("GET", f"/filtered", data=params)
 
         # Ensure response includes both 'tools' and 'columns'
         if (
@@ -346,30 +686,51 @@ def fetch_filtered(keyword):
 
         return response["tools"], response["columns"]
 
-    keyword = f"%{keyword}%"
-    with Session() as session:
-        # Query the database for matching tools
-        query = select(Tool).filter(
-            Tool.ToolName.like(keyword)
-            | Tool.ToolType.like(keyword)
-            | Tool.ManufacturerName.like(keyword)
-            | cast(Tool.ToolNumber, String).like(keyword)
-            | Tool.Shape.like(keyword)
-            | Tool.PartNumber.like(keyword)
+    like_keyword = f"{keyword}%" if prefix else f"%{keyword}%"
+    text_columns = [Tool.__table__.c[column] for column in FTS_COLUMNS]
+    if DB_DIALECT == "postgresql":
+        # ILIKE is what the pg_trgm indexes serve, and it matches the
+        # case-insensitive LIKE of SQLite and MySQL
+        text_match = or_(*(column.ilike(like_keyword) for column in text_columns))
+    else:
+        text_match = or_(*(column.like(like_keyword) for column in text_columns))
+    number_match = cast(Tool.ToolNumber, String).like(like_keyword)
+
+    # The trigram index matches the keyword literally, so keywords holding LIKE
+    # wildcards keep the plain LIKE search
+    use_fts = FTS_ENABLED and len(keyword) >= 3 and not _LIKE_WILDCARDS & set(keyword)
+
+    if use_fts:
+        # Trigram index lookup; the keyword is matched as one quoted phrase
+        phrase = '"' + keyword.replace('"', '""') + '"'
+        condition = Tool.ToolNumber.in_(
+            text("SELECT rowid FROM tools_fts WHERE tools_fts MATCH :phrase")
+            .bindparams(phrase=phrase)
+            .columns(Tool.ToolNumber)
         )
-        tools = session.execute(query).scalars().all()
-
-        # Extract column names dynamically
-        columns = Tool.__table__.columns.keys()
-
-        # Convert each SQLAlchemy row object into a dictionary
-        rows_as_dicts = [tool.__dict__ for tool in tools]
-
-        # Remove SQLAlchemy's internal state key ("_sa_instance_state")
-        for row in rows_as_dicts:
-            row.pop("_sa_instance_state", None)
+        # The index only narrows the candidates; LIKE still decides the match,
+        # so results are the same as without it (the trigram tokenizer also
+        # case-folds non-ASCII text, which LIKE does not)
+        condition = condition & text_match
+        # Only a numeric keyword can match the tool number itself
+        if keyword.isdigit():
+            condition = condition | number_match
+    else:
+        if DB_DIALECT == "sqlite":
+            # Skip the LIKEs for rows whose fingerprint lacks one of the keyword's
+            # characters; LIKE wildcards match anything and are left out
+            pattern_fp = name_fingerprint(keyword.replace("%", "").replace("_", ""))
+            fingerprint_match = Tool.name_fp.is_(None) | (
+                Tool.name_fp.op("&")(pattern_fp) == pattern_fp
+            )
+            text_match = fingerprint_match & text_match
+        condition = text_match | number_match
 
-        return rows_as_dicts, columns
+    with Session() as session:
+        # Query the database for matching tools (Core rows, no ORM hydration)
+        query = select(*TOOL_SELECT_COLUMNS).where(condition)
+        rows = session.execute(query).mappings().all()
+        return [dict(row) for row in rows], list(TOOL_COLUMNS)
 
 
 def fetch_tool_numbers_and_details():
@@ -464,7 +825,54 @@ def fetch_startup_shape_data():
         return {}, {}
 
 
+# The shapes catalog is effectively read-only, so lookups are kept for a short
+# while to spare dropdown refreshes a round trip. Anything that edits FCShapes
+# should call fetch_shapes.invalidate()
+SHAPES_CACHE_TTL = 60
+_shapes_cache = {}
+
+
+def _cached_shape_lookup(key, fetch, argument):
+    """
+    Return fetch(argument) from the shapes cache, calling it when the entry is
+    missing or expired. Failed or empty lookups are not cached.
+    """
+    now = time.monotonic()
+    cached = _shapes_cache.get(key)
+    if cached is None or cached[0] <= now:
+        result = fetch(argument)
+        if not result:
+            return result
+        cached = _shapes_cache[key] = (now + SHAPES_CACHE_TTL, result)
+    return cached[1]
+
+
 def fetch_shapes(shape_name=None):
+    """
+    Fetch all shape types, or one shape's row when shape_name is given.
+    Results are cached for SHAPES_CACHE_TTL seconds; failed or empty lookups
+    are not cached.
+    """
+    result = _cached_shape_lookup(shape_name or None, _fetch_shapes, shape_name)
+    # Hand out a copy of the list so callers cannot alter the cached one
+    return list(result) if isinstance(result, list) else result
+
+
+def fetch_cached_shape_by_type(shape_type):
+    """
+    fetch_shapes_by_type() through the shapes cache: a shape's row is kept for
+    SHAPES_CACHE_TTL seconds, a failed lookup is retried on the next call, and
+    fetch_shapes.invalidate() clears these entries as well.
+    """
+    return _cached_shape_lookup(
+        ("shape_type", shape_type), fetch_shapes_by_type, shape_type
+    )
+
+
+fetch_shapes.invalidate = _shapes_cache.clear
+
+
+def _fetch_shapes(shape_name=None):
     if DB_MODE == "api":
         if not shape_name:
             # Fetch all shape types for dropdown
@@ -778,6 +1186,14 @@ def resolve_shape_info(shape_value, subtype_lookup=None):
         return {"parent_shape": shape_value, "subtype": None, "is_subtype": False}
 
 
+# Prebuilt per-column DISTINCT queries: reused across calls so they hit the
+# compiled-statement cache, and column names never reach the SQL as raw text
+_UNIQUE_VALUE_QUERIES = {
+    column.name: select(column).distinct().where(column.isnot(None))
+    for column in TOOL_SELECT_COLUMNS
+}
+
+
 def fetch_unique_column_values(column_name):
     """
     Fetch unique values for a given column from the tools table, or via API.
@@ -793,12 +1209,12 @@ def fetch_unique_column_values(column_name):
         response = make_api_request("GET", f"/unique_column_values/tools/{column_name}")
         return list(response["unique_values"])
 
+    query = _UNIQUE_VALUE_QUERIES.get(column_name)
+    if query is None:
+        raise ValueError(f"Unknown column in tools table: {column_name}")
+
     with Session() as session:
-        query = text(
-            f"SELECT DISTINCT {column_name} FROM tools WHERE {column_name} IS NOT NULL"
-        )
-        result = session.execute(query).fetchall()
-        return [row[0] for row in result]
+        return session.execute(query).scalars().all()
 
 
 def fetch_image_hash(tool_number):
@@ -816,8 +1232,8 @@ def fetch_image_hash(tool_number):
         return response["image_hash"]
 
     with Session() as session:
-        tool = session.query(Tool).filter_by(ToolNumber=tool_number).first()
-        return tool.ImageHash if tool else None
+        query = select(Tool.ImageHash).where(Tool.ToolNumber == tool_number)
+        return session.execute(query).scalar()
 
 
 def insert(tool_data):
@@ -830,50 +1246,74 @@ def insert(tool_data):
     if DB_MODE == "api":
         return make_api_request("POST", "/insert/tool", data=tool_data)
 
-    with Session() as session:
-        # Exclude ImageHash
-        filtered_tool_data = {
-            key: value for key, value in tool_data.items() if key != "ImageHash"
-        }
+    insert_many([tool_data])
+
+
+def insert_many(tool_rows):
+    """
+    Insert several tools into the tools, tool and tool_properties tables in one
+    transaction, or via API.
 
-        # Preprocess ToolMaxRPM for Tool (as INT)
+    Each table gets a single executemany INSERT instead of one round trip per
+    tool, which matters for bulk loads such as imports and migrations.
+
+    Args:
+        tool_rows (List[dict]): Tool data dictionaries, as accepted by insert().
+    """
+    if DB_MODE == "api":
+        # The API accepts one tool per request
+        return [make_api_request("POST", "/insert/tool", data=row) for row in tool_rows]
+
+    if not tool_rows:
+        return
+
+    # Preprocess every row before touching the database. Rows are normalized to
+    # the same keys because executemany binds one parameter set per row.
+    tool_values = []
+    tool_record_values = []
+    tool_properties_values = []
+    for tool_data in tool_rows:
+        # ToolMaxRPM is stored as INT for Tool and FLOAT for tool_properties
         tool_max_rpm_int = int(
             extract_numeric(tool_data.get("ToolMaxRPM"), field_type="rpm") or 0
         )
-        filtered_tool_data["ToolMaxRPM"] = (
-            tool_max_rpm_int  # Add processed integer value for ToolMaxRPM
-        )
 
-        # Insert into the main Tool table
-        tool = Tool(**filtered_tool_data)
-        session.add(tool)
-
-        # Convert ToolDiameter to numeric (imperial if necessary)
-        diameter = extract_numeric(
-            tool_data.get("ToolDiameter"), field_type="dimension"
+        # Every column except ImageHash
+        filtered_tool_data = {
+            column: tool_data.get(column)
+            for column in TOOL_COLUMNS
+            if column != "ImageHash"
+        }
+        filtered_tool_data["ToolMaxRPM"] = tool_max_rpm_int
+        filtered_tool_data["name_fp"] = name_fingerprint(
+            *(tool_data.get(column) for column in FTS_COLUMNS)
         )
+        tool_values.append(filtered_tool_data)
 
-        # Insert into the `tool` table
-        tool_record = ToolModel(
-            tool_no=tool_data["ToolNumber"],
-            diameter=diameter,
-            remark=tool_data["ToolName"],
-            tool_table_id=1,  # Always use tool_table_id = 1
+        # Convert ToolDiameter to numeric (imperial if necessary)
+        tool_record_values.append(
+            {
+                "tool_no": tool_data["ToolNumber"],
+                "diameter": extract_numeric(
+                    tool_data.get("ToolDiameter"), field_type="dimension"
+                ),
+                "remark": tool_data["ToolName"],
+                "tool_table_id": 1,  # Always use tool_table_id = 1
+            }
         )
-        session.add(tool_record)
-
-        # Preprocess ToolMaxRPM for tool_properties (as FLOAT)
-        tool_max_rpm_float = float(tool_max_rpm_int)
-
-        # Insert into the `tool_properties` table
-        tool_properties_record = ToolPropertiesModel(
-            tool_no=tool_data["ToolNumber"],
-            max_rpm=tool_max_rpm_float,  # Use float value for ToolMaxRPM
-            tool_table_id=1,  # Always use tool_table_id = 1
+        tool_properties_values.append(
+            {
+                "tool_no": tool_data["ToolNumber"],
+                "max_rpm": float(tool_max_rpm_int),
+                "tool_table_id": 1,  # Always use tool_table_id = 1
+            }
         )
-        session.add(tool_properties_record)
 
-        session.commit()
+    # All three inserts share one transaction that commits when the block exits
+    with Session() as session, session.begin():
+        session.execute(Tool.__table__.insert(), tool_values)
+        session.execute(ToolModel.__table__.insert(), tool_record_values)
+        session.execute(ToolPropertiesModel.__table__.insert(), tool_properties_values)
 
 
 def update(tool_number, updated_data):
@@ -889,61 +1329,71 @@ def update(tool_number, updated_data):
 
     excluded_fields = {"ImageHash"}  # Fields to exclude from updates
 
-    with Session() as session:
-        # Update the main Tool table
-        query = select(Tool).filter_by(ToolNumber=tool_number)
-        tool = session.execute(query).scalars().first()
-        if tool:
-            tool_max_rpm_int = int(
-                extract_numeric(updated_data.get("ToolMaxRPM"), field_type="rpm") or 0
-            )
-            updated_tool_data = {
-                key: value
-                for key, value in updated_data.items()
-                if key not in excluded_fields
-            }
-            updated_tool_data["ToolMaxRPM"] = tool_max_rpm_int
-
-            for key, value in updated_tool_data.items():
-                setattr(tool, key, value)
-            session.commit()
-            print(
-                f"Tool {tool_number} updated successfully, excluding fields: {excluded_fields}."
+    updated_tool_data = {
+        key: value
+        for key, value in updated_data.items()
+        if key not in excluded_fields and key in TOOL_COLUMNS
+    }
+
+    # Keep the search fingerprint in step with the text it covers. Without every
+    # covered column at hand, clear it; set_db_mode() fills it in again.
+    if any(column in updated_tool_data for column in FTS_COLUMNS):
+        if all(column in updated_tool_data for column in FTS_COLUMNS):
+            updated_tool_data["name_fp"] = name_fingerprint(
+                *(updated_tool_data[column] for column in FTS_COLUMNS)
             )
         else:
-            print(f"Tool {tool_number} not found.")
+            updated_tool_data["name_fp"] = None
+
+    # Parse ToolMaxRPM once, and only when it is being changed
+    rpm_changed = "ToolMaxRPM" in updated_data
+    if rpm_changed:
+        tool_max_rpm = extract_numeric(updated_data["ToolMaxRPM"], field_type="rpm")
+        updated_tool_data["ToolMaxRPM"] = int(tool_max_rpm or 0)
+
+    tool_record_data = {}
+    if "ToolDiameter" in updated_data:
+        diameter = extract_numeric(updated_data["ToolDiameter"], field_type="dimension")
+        if diameter is not None:
+            tool_record_data["diameter"] = diameter
+    if "ToolName" in updated_data:
+        tool_record_data["remark"] = updated_data["ToolName"]
+
+    # Table-level statements skip the ORM bulk-update machinery; all changes
+    # commit together when the block exits
+    tools = Tool.__table__
+    tool_records = ToolModel.__table__
+    tool_properties = ToolPropertiesModel.__table__
+    with Session() as session, session.begin():
+        # Update the main Tool table
+        if updated_tool_data:
+            result = session.execute(
+                tools.update()
+                .where(tools.c.ToolNumber == tool_number)
+                .values(**updated_tool_data)
+            )
+            if result.rowcount:
+                print(
+                    f"Tool {tool_number} updated successfully, excluding fields: {excluded_fields}."
+                )
+            else:
+                print(f"Tool {tool_number} not found.")
 
         # Update the `tool` table
-        tool_record = (
-            session.execute(select(ToolModel).filter_by(tool_no=tool_number))
-            .scalars()
-            .first()
-        )
-        if tool_record:
-            if "ToolDiameter" in updated_data:
-                diameter = extract_numeric(
-                    updated_data["ToolDiameter"], field_type="dimension"
-                )
-                if diameter is not None:
-                    tool_record.diameter = diameter
-            if "ToolName" in updated_data:
-                tool_record.remark = updated_data["ToolName"]
-            session.commit()
+        if tool_record_data:
+            session.execute(
+                tool_records.update()
+                .where(tool_records.c.tool_no == tool_number)
+                .values(**tool_record_data)
+            )
 
         # Update the `tool_properties` table
-        tool_properties_record = (
-            session.execute(select(ToolPropertiesModel).filter_by(tool_no=tool_number))
-            .scalars()
-            .first()
-        )
-        if tool_properties_record:
-            if "ToolMaxRPM" in updated_data:
-                tool_max_rpm_float = float(
-                    extract_numeric(updated_data.get("ToolMaxRPM"), field_type="rpm")
-                    or 0
-                )
-                tool_properties_record.max_rpm = tool_max_rpm_float
-            session.commit()
+        if rpm_changed:
+            session.execute(
+                tool_properties.update()
+                .where(tool_properties.c.tool_no == tool_number)
+                .values(max_rpm=float(tool_max_rpm or 0))
+            )
 
 
 def update_image_hash(tool_number, image_hash):
@@ -962,12 +1412,13 @@ def update_image_hash(tool_number, image_hash):
             "PUT", f"/update_image_hash/{tool_number}", data={"image_hash": image_hash}
         )
 
-    with Session() as session:
-        query = select(Tool).filter_by(ToolNumber=tool_number)
-        tool = session.execute(query).scalars().first()
-        if tool:
-            tool.ImageHash = image_hash
-            session.commit()
+    tools = Tool.__table__
+    with Session() as session, session.begin():
+        session.execute(
+            tools.update()
+            .where(tools.c.ToolNumber == tool_number)
+            .values(ImageHash=image_hash)
+        )
 
 
 def delete(tool_number):
@@ -980,36 +1431,24 @@ def delete(tool_number):
     if DB_MODE == "api":
         return make_api_request("DELETE", f"/delete/tool/{tool_number}")
 
-    with Session() as session:
+    tools = Tool.__table__
+    tool_records = ToolModel.__table__
+    tool_properties = ToolPropertiesModel.__table__
+
+    # One transaction for all three tables, committed when the block exits
+    with Session() as session, session.begin():
         # Delete from the main Tool table
-        tool = (
-            session.execute(select(Tool).filter_by(ToolNumber=tool_number))
-            .scalars()
-            .first()
-        )
-        if tool:
-            session.delete(tool)
+        session.execute(tools.delete().where(tools.c.ToolNumber == tool_number))
 
         # Delete from the `tool_properties` table
-        tool_properties_record = (
-            session.execute(select(ToolPropertiesModel).filter_by(tool_no=tool_number))
-            .scalars()
-            .first()
+        session.execute(
+            tool_properties.delete().where(tool_properties.c.tool_no == tool_number)
         )
-        if tool_properties_record:
-            session.delete(tool_properties_record)
 
         # Delete from the `tool` table
-        tool_record = (
-            session.execute(select(ToolModel).filter_by(tool_no=tool_number))
-            .scalars()
-            .first()
+        session.execute(
+            tool_records.delete().where(tool_records.c.tool_no == tool_number)
         )
-        if tool_record:
-            session.delete(tool_record)
-
-        # Commit all changes in a single transaction
-        session.commit()
 
 
 def extract_numeric(value, field_type=None):
@@ -1028,24 +1467,20 @@ def extract_numeric(value, field_type=None):
     if not value:
         return None
 
-    value = value.replace(",", "")
+    if "," in value:
+        value = value.replace(",", "")
 
     # Extract the numeric portion
-    match = re.search(r"-?[0-9.]+", value)
+    match = _NUMERIC_RE.search(value)
     if not match:
         return None
 
     number = float(match.group())
 
-    # Check for units if field_type is 'dimension'
-    if field_type == "dimension":
-        # Convert to lowercase for unit matching
-        value = value.lower()
-
-        # If the value is in mm, convert to inches
-        if "mm" in value:
+    # Check for units if field_type is 'dimension'; plain numbers have none
+    if field_type == "dimension" and match.end() - match.start() != len(value):
+        # If the value is in mm, convert to inches; anything else is inches
+        if "mm" in value.lower():
             number /= 25.4  # Convert millimeters to inches
-        elif '"' in value or "in" in value:
-            pass  # Already in inches; no conversion needed
 
     return number
@@ -1,14 +1,23 @@
-import re
+import os
 from settings import load_config
 
-# Load configuration
-config = load_config()
+# Tools kept from the master table even when the updater omits them
+EXCEPTIONS = frozenset({"T100"})  # Example tool numbers
+
+# Fixed-width tool line: tool, pocket, Z, D, U, then the remark
+LINE_FORMAT = "%-7s%-7s%-13s%-13s%-5s %s"
+DEFAULT_Z = "Z+0.000000"
+
+
+def _first_token(tokens, prefix, default=None):
+    """Return the first token starting with `prefix`, e.g. "D0.125" for "D"."""
+    return next((token for token in tokens if token.startswith(prefix)), default)
 
 
 # Fixing header detection and preserving U, Z, and D in the correct order
 def read_master_file(file_path):
     with open(file_path, "r") as file:
-        lines = file.readlines()
+        lines = file.read().splitlines()
 
     header = None
     data = {}
@@ -29,7 +38,7 @@ def read_master_file(file_path):
 # Read updater file and return data in the correct format
 def read_updater_file(file_path):
     with open(file_path, "r") as file:
-        lines = file.readlines()
+        lines = file.read().splitlines()
 
     data = {}
     is_extended_format = lines[0].startswith(";")
@@ -44,7 +53,7 @@ def read_updater_file(file_path):
             tool_data = tool_info.split()
             tool = tool_data[0]
             pocket = tool_data[1][1:]  # Strip 'P'
-            diameter_metric = float([x for x in tool_data if x.startswith("D")][0][1:])
+            diameter_metric = float(_first_token(tool_data, "D")[1:])
         else:
             # Handle both "D0.125;comment" and "D0.125 ;comment" formats
             parts = line.split(";", 1)
@@ -54,7 +63,7 @@ def read_updater_file(file_path):
             tool_data = tool_info.split()
             tool = tool_data[0]
             pocket = tool.split("T")[1]
-            diameter_metric = float([x for x in tool_data if x.startswith("D")][0][1:])
+            diameter_metric = float(_first_token(tool_data, "D")[1:])
 
         # Convert diameter to imperial
         # diameter_imperial = diameter_metric * 25.4
@@ -78,24 +87,19 @@ def read_updater_file(file_path):
 
 
 def update_master_file(master_data, updater_data):
-    exceptions = ["T100"]  # Example tool numbers
     updated_data = {}
 
     for tool, updater_info in updater_data.items():
-        if tool in exceptions:
+        if tool in EXCEPTIONS:
             updated_data[tool] = master_data[tool]
             continue
 
         if tool in master_data:
             # Split the master data line and remove extra spaces
-            master_parts = re.split(r"\s+", master_data[tool].strip())
+            master_parts = master_data[tool].split()
 
-            # Extract `Z` from the master data (preserve it)
-            z_value = next((p for p in master_parts if p.startswith("Z+")), None)
-
-            # If no `Z` found in master, use a default value
-            if not z_value:
-                z_value = "Z+0.000000"
+            # Extract `Z` from the master data (preserve it), defaulting if absent
+            z_value = next((p for p in master_parts if p[:2] == "Z+"), DEFAULT_Z)
 
             # Get D and U from the updater info (these are updated from the database)
             d_value = updater_info["diameter"].strip()
@@ -105,51 +109,54 @@ def update_master_file(master_data, updater_data):
             final_remark = updater_info["remark"]
 
             # Format the updated line correctly, ensuring proper spacing and integer U handling
-            updated_data[tool] = (
-                f"{master_parts[0]:<7}{master_parts[1]:<7}{z_value:<13}{d_value:<13}{u_value:<5} {final_remark}\n"
+            updated_data[tool] = LINE_FORMAT % (
+                master_parts[0],
+                master_parts[1],
+                z_value,
+                d_value,
+                u_value,
+                final_remark,
             )
         else:
             # Add a new tool if it's not in the master data, with correct spacing
             u_value = updater_info.get("u_value", "U0")
-            new_entry = "{:<7}P{:<6}Z+0.000000   {:<13}{:<5} {}".format(
+            updated_data[tool] = LINE_FORMAT % (
                 tool,
-                "0",
+                "P0",
+                DEFAULT_Z,
                 updater_info["diameter"],
                 u_value,
                 updater_info["remark"],
             )
-            updated_data[tool] = new_entry
 
-    # Remove tools not in the updater file unless they are in the exceptions list
-    for tool in list(master_data.keys()):  # Convert to list to avoid runtime error
-        if tool not in updater_data and tool not in exceptions:
-            del master_data[tool]
-
-    # Append new tools to updated_data, ensuring exceptions are retained
-    for tool, entry in master_data.items():
-        if tool not in updated_data:
-            updated_data[tool] = entry
+    # Tools missing from the updater file are dropped, except for the
+    # exceptions still present in the master file
+    for tool in EXCEPTIONS.intersection(master_data):
+        updated_data.setdefault(tool, master_data[tool])
 
     return updated_data
 
 
 def write_master_file(file_path, header, data):
-    with open(file_path, "w") as file:
-        if header:
-            file.write(
-                header.strip() + "\n"
-            )  # Ensure the header ends with a single newline
-        sorted_entries = sorted(
-            data.values(), key=lambda x: int(x.split()[0][1:])
-        )  # Sort by numeric tool number
-        for line in sorted_entries:
-            file.write(
-                line.strip() + "\n"
-            )  # Ensure each line ends with a single newline
+    # Sort by numeric tool number, taken from the "T<n>" keys rather than by
+    # re-splitting every line
+    sorted_tools = sorted(data, key=lambda tool: int(tool[1:]))
+
+    # Ensure the header and each line end with a single newline
+    lines = [header.strip()] if header else []
+    lines.extend(data[tool].strip() for tool in sorted_tools)
+
+    # Write the whole table to a temporary file in one call, then swap it in
+    # so an interrupted write never leaves a truncated tool table
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        file.write("".join(line + "\n" for line in lines))
+    os.replace(tmp_path, file_path)
 
 
 def main(update_data=None, master_file_path=None, updater_file_path=None):
     # Use config paths if not provided
+    config = load_config()
     if master_file_path is None:
         master_file_path = config.get("file_paths", {}).get(
             "master_tool_table", "tool.tbl"
@@ -175,16 +182,11 @@ def main(update_data=None, master_file_path=None, updater_file_path=None):
 
             tool_data = tool_info.split()
             tool = tool_data[0]
-            diameter_str = [x for x in tool_data if x.startswith("D")][0]
-            diameter_value = float(diameter_str[1:])
+            diameter_value = float(_first_token(tool_data, "D")[1:])
             diameter_imperial_str = f"D+{diameter_value:.6f}"
 
             # Extract U value from the update data
-            u_str = (
-                [x for x in tool_data if x.startswith("U")][0]
-                if any(x.startswith("U") for x in tool_data)
-                else "U0"
-            )
+            u_str = _first_token(tool_data, "U", "U0")
 
             if remark and not remark.startswith(";"):
                 remark = "; " + remark
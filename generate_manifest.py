@@ -2,6 +2,7 @@ import os
 import json
 import sys
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 
 
 def load_config(config_file="config.yaml"):
@@ -9,19 +10,28 @@ def load_config(config_file="config.yaml"):
     if not os.path.exists(config_file):
         return None
     with open(config_file, "r") as file:
-        return yaml.safe_load(file)
+        # libyaml's C parser when PyYAML was built with it
+        return yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
 
 def list_files(directory, file_filter=None):
-    return [
-        f
-        for f in os.listdir(directory)
-        if os.path.isfile(os.path.join(directory, f))
-        and (file_filter(f) if file_filter else True)
-    ]
+    # scandir entries carry their file type, so there is no stat() per file
+    with os.scandir(directory) as entries:
+        return [
+            entry.name
+            for entry in entries
+            if entry.is_file() and (file_filter(entry.name) if file_filter else True)
+        ]
 
 
-def main(source_dir, manifest_path):
+def scan_group(path):
+    """Sorted file names in a manifest group's directory, or [] if it is missing."""
+    if os.path.isdir(path):
+        return sorted(list_files(path))
+    return []
+
+
+def main(source_dir, manifest_path, pretty=False):
     manifest = {}
 
     # Load config to get versions dynamically
@@ -58,25 +68,36 @@ def main(source_dir, manifest_path):
     source_subdirs["PostProcessor"] = os.path.join(source_dir, "PostProcessor")
     source_subdirs["Jobs"] = os.path.join(source_dir, "Jobs")
 
-    # Scan each subdir
-    for group, path in source_subdirs.items():
-        if os.path.isdir(path):
-            manifest[group] = sorted(list_files(path))
-        else:
-            manifest[group] = []
+    # Scan each subdir; the scans are independent and I/O-bound
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scanned = executor.map(scan_group, source_subdirs.values())
+        manifest.update(zip(source_subdirs, scanned))
+
+    # Write manifest (sort keys for stable output). It is read by tooling, so it
+    # is compact unless pretty output is requested.
+    if pretty:
+        content = json.dumps(manifest, indent=2, sort_keys=True)
+    else:
+        content = json.dumps(manifest, separators=(",", ":"), sort_keys=True)
 
-    # Write manifest (sort keys for stable output)
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2, sort_keys=True)
+    # Write to a temporary file and swap it in, so readers never see a
+    # partially written manifest
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, manifest_path)
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
-        print("Usage: python generate_manifest.py <source_dir> <manifest_path>")
+        print(
+            "Usage: python generate_manifest.py <source_dir> <manifest_path> [--pretty]"
+        )
         sys.exit(1)
     source_dir = sys.argv[1]
     manifest_path = sys.argv[2]
+    pretty = "--pretty" in sys.argv[3:]
     if not os.path.isdir(source_dir):
         print(f"Error: {source_dir} is not a directory.")
         sys.exit(1)
-    main(source_dir, manifest_path)
+    main(source_dir, manifest_path, pretty=pretty)
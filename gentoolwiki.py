@@ -2,13 +2,19 @@
 
 import sqlite3
 import os
+import argparse
 import qrcode
-from io import BytesIO
+import filecmp
 import requests
+from urllib3.util.retry import Retry
 import hashlib
 import json
+import math
 from fractions import Fraction
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
+import threading
 from settings import load_config
 from db_utils import *
 from generate_manifest import main as generate_manifest_main
@@ -28,6 +34,55 @@ API_URL = config.get("api", {}).get("url", "http://127.0.0.0:8000")
 DB_MODE = config.get("api", {}).get("mode", "direct")
 set_db_mode(DB_MODE, API_URL)  # This will initialize the DB_MODE in db_utils
 
+# orjson is optional; it serializes indented JSON several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_indented_json(data, sort_keys=False):
+    """
+    Serialize data like json.dumps(data, indent=2), using orjson when available.
+
+    orjson writes non-ASCII characters unescaped; such documents go through the
+    stdlib encoder so their files keep the \\uXXXX escapes json.dump wrote.
+
+    Args:
+        data: The JSON-serializable object.
+        sort_keys (bool): Sort dictionary keys in the output.
+
+    Returns:
+        str: The indented JSON text.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        content = orjson.dumps(data, option=option)
+        if content.isascii() and b"\x7f" not in content:
+            return content.decode()
+    return json.dumps(data, indent=2, sort_keys=sort_keys)
+
+
+# Measurement such as "12.34 in", "45.67mm" or '89.01"': (number, unit)
+_NUM_UNIT_RE = re.compile(r"^([\d\.]+)\s*([a-zA-Z\"']*)$")
+
+# Characters that are not allowed in filenames
+_FILENAME_UNSAFE_RE = re.compile(r'[<>:"/\\|?*\n\r]+')
+
+# QR code encoding settings; part of the sidecar key so changing them
+# regenerates every code
+QR_CODE_OPTIONS = {
+    "error_correction": qrcode.constants.ERROR_CORRECT_M,
+    "box_size": 10,
+    "border": 2,
+}
+
+# Wiki page template placeholders such as [ToolName] or [INSERT_TAPERANGLE]
+_PLACEHOLDER_RE = re.compile(r"\[([A-Za-z_]+)\]")
+
+# Runs of spaces and slashes in a wiki section header
+_ANCHOR_SEPARATORS_RE = re.compile(r"[ /]+")
+
 
 def sanitize_filename(name):
     """
@@ -50,7 +105,7 @@ def sanitize_filename(name):
     name = name.replace('"', "in")
 
     # Replace any non-alphanumeric, non-space, and non-period characters with underscores
-    clean_name = re.sub(r'[<>:"/\\|?*\n\r]+', "_", name)
+    clean_name = _FILENAME_UNSAFE_RE.sub("_", name)
 
     return clean_name.strip()
 
@@ -108,6 +163,9 @@ def get_version_paths(version):
     return {"bits_dir": bits_dir, "library_path": library_path}
 
 
+# Pure in its arguments, and tool libraries reuse a small set of sizes, so each
+# distinct measurement is parsed and converted to a fraction only once
+@lru_cache(maxsize=1024)
 def format_measurement(
     value, convert_to_fraction=False, add_quotes=False, strip_trailing_zeros=False
 ):
@@ -131,7 +189,7 @@ def format_measurement(
 
     try:
         # Normalize the input (e.g., "5in" -> "5 in", "5" -> "5 in")
-        match = re.match(r"^([\d\.]+)\s*([a-zA-Z\"']*)$", value.strip())
+        match = _NUM_UNIT_RE.match(value.strip())
         if not match:
             return value  # Return as-is if it doesn't match expected formats
 
@@ -150,19 +208,29 @@ def format_measurement(
                 if num.is_integer():
                     formatted_value = f"{int(num)}"
                 else:
-                    fraction = Fraction(num).limit_denominator(64)
-                    if fraction.numerator > fraction.denominator:
+                    sixty_fourths = num * 64  # Exact: scaling by a power of two
+                    if sixty_fourths.is_integer():
+                        # Exact 1/64ths (1/8", 3/16", ...) reduce with integer math
+                        numerator = int(sixty_fourths)
+                        divisor = math.gcd(numerator, 64)
+                        numerator //= divisor
+                        denominator = 64 // divisor
+                    else:
+                        fraction = Fraction(num).limit_denominator(64)
+                        numerator = fraction.numerator
+                        denominator = fraction.denominator
+                    if numerator > denominator:
                         # Mixed fraction format
-                        whole = fraction.numerator // fraction.denominator
-                        remainder = fraction.numerator % fraction.denominator
+                        whole = numerator // denominator
+                        remainder = numerator % denominator
                         formatted_value = (
-                            f"{whole}-{remainder}/{fraction.denominator}"
+                            f"{whole}-{remainder}/{denominator}"
                             if remainder > 0
                             else f"{whole}"
                         )
                     else:
                         # Proper fraction
-                        formatted_value = f"{fraction.numerator}/{fraction.denominator}"
+                        formatted_value = f"{numerator}/{denominator}"
             else:
                 # Keep the original value as-is (retain decimal places from input)
                 formatted_value = num_str
@@ -208,7 +276,7 @@ def extract_numeric_value_with_unit(value):
         return 0.0, "in"  # Default to inches if invalid
 
     # Match numeric part and optional unit
-    match = re.match(r"^([\d\.]+)\s*([a-zA-Z\"']*)$", value.strip())
+    match = _NUM_UNIT_RE.match(value.strip())
     if match:
         numeric_value = float(match.group(1))
         unit = match.group(2).strip() or "in"  # Default to inches if no unit
@@ -237,6 +305,34 @@ def convert_to_original_unit(value, unit):
         return f"{value:.4f} {unit}"  # Default for unknown units
 
 
+# Every tool of a shape shares that shape's parameter/attribute name lists, so
+# they are parsed once per distinct FCShapes schema
+@lru_cache(maxsize=128)
+def _parse_shape_field_names(raw_json):
+    """Parse an FCShapes ShapeParameter/ShapeAttribute JSON list into a tuple."""
+    return tuple(json.loads(raw_json or "[]"))
+
+
+def json_column(tool, column):
+    """
+    Return a JSON object column of a tool row as a dict.
+
+    Accepts the raw TEXT from the database or a value that was already parsed,
+    so callers can parse a tool's columns once and reuse them.
+
+    Args:
+        tool (dict): The tool's row from the database.
+        column (str): The column name, e.g. "ShapeParameter".
+
+    Returns:
+        dict: The parsed column, or {} if it is empty.
+    """
+    value = tool.get(column)
+    if isinstance(value, dict):
+        return value
+    return json.loads(value or "{}")
+
+
 def map_tool_to_json(
     tool, columns, version="v1-0", subtype_lookup=None, shape_cache=None
 ):
@@ -265,7 +361,7 @@ def map_tool_to_json(
     shape_data = (
         shape_cache.get(parent_shape)
         if shape_cache
-        else fetch_shapes_by_type(parent_shape)
+        else fetch_cached_shape_by_type(parent_shape)
     )
     if not shape_data:
         print(f"Shape type '{parent_shape}' not found in FCShapes.")
@@ -291,16 +387,12 @@ def map_tool_to_json(
     }
 
     # Parse ShapeParameter and ShapeAttribute from the database
-    shape_parameters_list = json.loads(shape_data.ShapeParameter or "[]")
-    shape_attributes_list = json.loads(shape_data.ShapeAttribute or "[]")
+    shape_parameters_list = _parse_shape_field_names(shape_data.ShapeParameter)
+    shape_attributes_list = _parse_shape_field_names(shape_data.ShapeAttribute)
 
     # Retrieve JSON values stored in the database
-    shape_parameters_values = json.loads(
-        tool_data_dict.get("ShapeParameter", "{}") or "{}"
-    )
-    shape_attributes_values = json.loads(
-        tool_data_dict.get("ShapeAttribute", "{}") or "{}"
-    )
+    shape_parameters_values = json_column(tool_data_dict, "ShapeParameter")
+    shape_attributes_values = json_column(tool_data_dict, "ShapeAttribute")
 
     # Special case: Handle bullnose.fcstd shape
     if shape_name == "bullnose.fcstd" and version == "v1-0":
@@ -356,6 +448,17 @@ def map_tool_to_json(
     return json_data
 
 
+# FreeCAD parameter names that are stored under a different database column
+_JSON_TO_SQLITE_COLUMNS = {
+    "Diameter": "ToolDiameter",
+    "Length": "OAL",
+    "CuttingEdgeHeight": "LOC",
+    "Material": "ToolMaterial",
+    "ShankDiameter": "ToolShankSize",
+}
+_SQLITE_TO_JSON_COLUMNS = {v: k for k, v in _JSON_TO_SQLITE_COLUMNS.items()}
+
+
 def map_column_names(param, direction="to_json"):
     """
     Map column names between SQLite and JSON parameter names.
@@ -369,19 +472,10 @@ def map_column_names(param, direction="to_json"):
     Returns:
         str: The corresponding mapped name, or the original param if no mapping exists.
     """
-    mapping = {
-        "Diameter": "ToolDiameter",
-        "Length": "OAL",
-        "CuttingEdgeHeight": "LOC",
-        "Material": "ToolMaterial",
-        "ShankDiameter": "ToolShankSize",
-    }
-
     if direction == "to_sqlite":
-        return mapping.get(param, param)
+        return _JSON_TO_SQLITE_COLUMNS.get(param, param)
     elif direction == "to_json":
-        reverse_mapping = {v: k for k, v in mapping.items()}
-        return reverse_mapping.get(param, param)
+        return _SQLITE_TO_JSON_COLUMNS.get(param, param)
     else:
         raise ValueError(
             f"Invalid direction: {direction}. Use 'to_json' or 'to_sqlite'."
@@ -487,8 +581,7 @@ def generate_json_files(
         output_file = os.path.join(output_directory, f"{sanitized_tool_name}.fctb")
 
         with open(output_file, "w", encoding="utf-8") as json_file:
-            json.dump(tool_json, json_file, sort_keys=True, indent=2)
-            json_file.write("\n")
+            json_file.write(dumps_indented_json(tool_json, sort_keys=True) + "\n")
         print(f"Generated {version} JSON file: {output_file}")
 
 
@@ -497,7 +590,8 @@ def get_image_hash(file_path):
     Compute the SHA-256 hash of a file.
 
     Reads the file in chunks to compute its SHA-256 hash, which is used to
-    verify if the file has changed.
+    verify if the file has changed. The digest format is shared with the stored
+    ImageHash values, so the algorithm must stay SHA-256.
 
     Args:
         file_path (str): The path to the file for which the hash is to be computed.
@@ -505,17 +599,21 @@ def get_image_hash(file_path):
     Returns:
         str: The SHA-256 hash of the file as a hexadecimal string.
     """
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        # Read and update hash string value in blocks of 4K
-        for byte_block in iter(lambda: f.read(4096), b""):
+        # Python 3.11+: hash straight from a reused buffer with the GIL released
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        sha256_hash = hashlib.sha256()
+        # Read and update hash string value in blocks of 1 MiB
+        for byte_block in iter(lambda: f.read(1 << 20), b""):
             sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        return sha256_hash.hexdigest()
 
 
 def make_anchor(header):
     # Replace spaces and slashes with a single underscore, collapse multiple underscores
-    anchor = re.sub(r"[ /]+", "_", header)
+    anchor = _ANCHOR_SEPARATORS_RE.sub("_", header)
     return anchor
 
 
@@ -549,28 +647,38 @@ def generate_index_page_content(tool_numbers=None):
 
     # Sort tools by ToolNumber
     tools_sorted = sorted(tools, key=lambda t: int(t["ToolNumber"]))
+    anchors = [make_anchor(header) for _, header in tool_groups]
+
+    # Bucket the tools into their groups in a single pass instead of rescanning
+    # the whole list for every group
+    group_of_number = {
+        number: index
+        for index, ((start, end), _) in enumerate(tool_groups)
+        for number in range(start, end + 1)
+    }
+    grouped_tools = [[] for _ in tool_groups]
+    for tool in tools_sorted:
+        index = group_of_number.get(int(tool["ToolNumber"]))
+        if index is not None:
+            grouped_tools[index].append(tool)
 
     # --- Create bookmarks/index at the top ---
     bookmark_lines = ["===Tool Groups==="]
     bookmark_lines.append('<span id="top"></span>\n')
-    for (start, end), header in tool_groups:
-        anchor = make_anchor(header)
+    for ((start, end), header), anchor in zip(tool_groups, anchors):
         bookmark_lines.append(f"[[#{anchor}|T{start}–T{end} / {header}]]<br>")
     bookmark_lines.append("")  # Blank line after bookmarks
 
     # --- Create grouped tool lists with anchors ---
+    link_prefix = f"*[[{index_page}/{page_prefix} "
     output_lines = []
-    for (start, end), header in tool_groups:
-        anchor = make_anchor(header)
-        group_tools = [
-            tool for tool in tools_sorted if start <= int(tool["ToolNumber"]) <= end
-        ]
+    for (_, header), anchor, group_tools in zip(tool_groups, anchors, grouped_tools):
         if group_tools:
             output_lines.append(f"\n<span id=\"{anchor}\"></span>\n'''{header}'''")
-            for tool in group_tools:
-                output_lines.append(
-                    f"*[[{index_page}/{page_prefix} {tool['ToolNumber']}|Tool {tool['ToolNumber']} - {tool['ToolName']}]]"
-                )
+            output_lines.extend(
+                f"{link_prefix}{tool['ToolNumber']}|Tool {tool['ToolNumber']} - {tool['ToolName']}]]"
+                for tool in group_tools
+            )
             output_lines.append("[[#Top|[Top]]]\n")  # Blank line between groups
 
     return "\n".join(bookmark_lines + output_lines)
@@ -609,10 +717,15 @@ def generate_tools_json(output_path=None, version="v1-0", tool_numbers=None):
 
     # Write to the output file
     with open(output_path, "w") as json_file:
-        json.dump(tools_data, json_file, indent=2)
+        json_file.write(dumps_indented_json(tools_data))
     print(f"Generated library file {version}: {output_path}")
 
 
+# Seconds to wait for the wiki to connect, and then between bytes of a reply;
+# without a limit one stalled connection holds up a publishing thread forever
+REQUEST_TIMEOUT = (10, config.get("wiki_settings", {}).get("request_timeout", 60))
+
+
 def create_session(api_url, username, password):
     """
     Create and return a session for MediaWiki API after logging in.
@@ -629,9 +742,21 @@ def create_session(api_url, username, password):
         requests.Session: An authenticated session for MediaWiki API calls.
     """
     session = requests.Session()
+    # Room for one pooled connection per publishing thread. Failed connects and
+    # 5xx answers to idempotent requests (token fetches) are retried with
+    # backoff; urllib3 never re-sends a POST that reached the server
+    adapter = requests.adapters.HTTPAdapter(
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
     login_token_response = session.get(
         api_url,
         params={"action": "query", "format": "json", "meta": "tokens", "type": "login"},
+        timeout=REQUEST_TIMEOUT,
     )
     login_token = login_token_response.json()["query"]["tokens"]["logintoken"]
 
@@ -644,12 +769,90 @@ def create_session(api_url, username, password):
             "lgtoken": login_token,
             "format": "json",
         },
+        timeout=REQUEST_TIMEOUT,
     )
     if response.json().get("login", {}).get("result") != "Success":
         raise Exception("Failed to log in to MediaWiki API")
     return session
 
 
+def get_csrf_token(session, api_url, refresh=False):
+    """
+    Return the CSRF token for a MediaWiki session, fetching it only once.
+
+    MediaWiki keeps a session's CSRF token for the session's lifetime, so it is
+    stored on the session object and reused by every later write.
+
+    Args:
+        session (requests.Session): The authenticated session for MediaWiki API.
+        api_url (str): The API endpoint URL for the MediaWiki instance.
+        refresh (bool): Fetch a new token even if one is already stored.
+
+    Returns:
+        str: The CSRF token.
+    """
+    token = getattr(session, "csrf_token", None)
+    if token is None or refresh:
+        token_response = session.get(
+            api_url,
+            params={
+                "action": "query",
+                "meta": "tokens",
+                "type": "csrf",
+                "format": "json",
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        token_response.raise_for_status()  # Raise an error for HTTP issues
+        token = (
+            token_response.json()
+            .get("query", {})
+            .get("tokens", {})
+            .get("csrftoken", None)
+        )
+        if not token:
+            raise ValueError("Failed to retrieve CSRF token from the wiki.")
+        session.csrf_token = token
+    return token
+
+
+def post_with_csrf_token(session, api_url, data, files=None):
+    """
+    POST a write action with the session's CSRF token.
+
+    If the wiki rejects the stored token as expired, a fresh token is fetched
+    and the request is sent once more.
+
+    Args:
+        session (requests.Session): The authenticated session for MediaWiki API.
+        api_url (str): The API endpoint URL for the MediaWiki instance.
+        data (dict): The form fields of the action, without the token.
+        files (dict, optional): Files to upload with the action.
+
+    Returns:
+        requests.Response: The response to the POST request.
+    """
+    for refresh in (False, True):
+        data["token"] = get_csrf_token(session, api_url, refresh=refresh)
+        response = session.post(
+            api_url, data=data, files=files, timeout=REQUEST_TIMEOUT
+        )
+        try:
+            error_code = response.json().get("error", {}).get("code")
+        except ValueError:
+            break  # Not a JSON API response; leave it to the caller
+        if error_code != "badtoken":
+            break
+    return response
+
+
+# Image uploads are limited separately from page edits, since MediaWiki rate
+# limits them separately and each one holds a whole image in memory
+image_upload_slots = threading.BoundedSemaphore(
+    config.get("wiki_settings", {}).get("upload_workers", 4)
+)
+
+
 def upload_image(session, api_url, file_path, file_name):
     """
     Upload an image file to MediaWiki.
@@ -666,25 +869,103 @@ def upload_image(session, api_url, file_path, file_name):
     Returns:
         dict: The response JSON from the MediaWiki API.
     """
-    edit_token_response = session.get(
-        api_url,
-        params={"action": "query", "meta": "tokens", "type": "csrf", "format": "json"},
-    )
-    edit_token = edit_token_response.json()["query"]["tokens"]["csrftoken"]
-
-    with open(file_path, "rb") as file:
+    with image_upload_slots, open(file_path, "rb") as file:
         files = {"file": (file_name, file.read())}
         data = {
             "action": "upload",
             "filename": file_name,
-            "token": edit_token,
             "format": "json",
             "ignorewarnings": "true",  # This allows overwriting existing files
         }
-        response = session.post(api_url, files=files, data=data)
+        response = post_with_csrf_token(session, api_url, data, files=files)
         return response.json()
 
 
+class LocalJsonCache:
+    """
+    A dictionary kept in a local JSON file, loaded on first use.
+
+    Safe to share between the publishing threads. Changes are only written to
+    disk by save().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._entries is None:
+                try:
+                    with open(self.path, "r") as cache_file:
+                        self._entries = json.load(cache_file)
+                except (OSError, ValueError):
+                    self._entries = {}
+        return self._entries
+
+    def get(self, key):
+        return self._load().get(key)
+
+    def set(self, key, value):
+        entries = self._load()
+        with self._lock:
+            entries[key] = value
+
+    def pop(self, key):
+        entries = self._load()
+        with self._lock:
+            return entries.pop(key, None)
+
+    def save(self):
+        """Write the cache back to disk, if it was used."""
+        with self._lock:
+            if self._entries is None:
+                return
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump(self._entries, cache_file)
+            os.replace(tmp_path, self.path)
+
+
+# Size, mtime and SHA-256 of every image hashed on this machine, so unchanged
+# images are not re-read on each publish. Stat data is machine-local, which is
+# why this lives in a local file rather than next to ImageHash in the database
+image_stat_cache = LocalJsonCache(
+    config["file_paths"].get("image_stat_cache", ".image_stat_cache.json")
+)
+
+# SHA-256 of the content last uploaded to each wiki page, so publishing skips
+# pages whose generated content has not changed
+wiki_page_cache = LocalJsonCache(
+    config["file_paths"].get("wiki_page_cache", ".wiki_page_cache.json")
+)
+
+
+def get_cached_image_hash(file_path):
+    """
+    Compute the SHA-256 hash of a file, skipping the read when unchanged.
+
+    The previous digest is reused while the file's size and modification time
+    match what was recorded when it was last hashed.
+
+    Args:
+        file_path (str): The path to the file for which the hash is to be computed.
+
+    Returns:
+        str: The SHA-256 hash of the file as a hexadecimal string.
+    """
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    entry = image_stat_cache.get(key)
+    if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+        return entry[2]
+
+    digest = get_image_hash(file_path)
+    image_stat_cache.set(key, [stat.st_size, stat.st_mtime_ns, digest])
+    return digest
+
+
 def upload_image_if_changed(session, api_url, file_path, file_name, tool_number):
     """
     Upload an image to MediaWiki only if it has changed and the file exists.
@@ -699,23 +980,24 @@ def upload_image_if_changed(session, api_url, file_path, file_name, tool_number)
     Returns:
         None
     """
-    # Check if the file exists
-    if not os.path.exists(file_path):
+    # Compute the current hash of the image (cached while size/mtime match).
+    # Its os.stat doubles as the existence check, so callers that already
+    # found the file in a directory listing pay for no extra lookup
+    try:
+        current_hash = get_cached_image_hash(file_path)
+    except FileNotFoundError:
         print(f"Image file not found: {file_path}. Skipping upload.")
         return
 
-    # Compute the current hash of the image
-    current_hash = get_image_hash(file_path)
-
     # Fetch the stored hash
     stored_hash = fetch_image_hash(tool_number)
 
-    update_image_hash(tool_number, current_hash)
-
-    # Compare hashes and upload if they differ
+    # Compare hashes and upload if they differ. The new hash is only stored
+    # once the upload succeeded, so a failed upload is retried on the next run
     if current_hash != stored_hash:
         response = upload_image(session, api_url, file_path, file_name)
         if response.get("upload", {}).get("result") == "Success":
+            update_image_hash(tool_number, current_hash)
             print(f"Image {file_name} uploaded and hash updated.")
         else:
             print(f"Failed to upload image {file_name}: {response}")
@@ -739,22 +1021,53 @@ def upload_wiki_page(session, api_url, page_title, content):
     Returns:
         dict: The response JSON from the MediaWiki API.
     """
-    edit_token_response = session.get(
-        api_url, params={"action": "query", "meta": "tokens", "format": "json"}
-    )
-    edit_token = edit_token_response.json()["query"]["tokens"]["csrftoken"]
-
-    response = session.post(
+    response = post_with_csrf_token(
+        session,
         api_url,
-        data={
+        {
             "action": "edit",
             "title": page_title,
             "text": content,
-            "token": edit_token,
             "format": "json",
         },
-    )
-    return response.json()
+    ).json()
+
+    # Remember what the page now holds; written to disk by wiki_page_cache.save()
+    if response.get("edit", {}).get("result") == "Success":
+        wiki_page_cache.set(_wiki_page_key(api_url, page_title), _content_hash(content))
+    return response
+
+
+def _wiki_page_key(api_url, page_title):
+    return f"{api_url}|{page_title}"
+
+
+def _content_hash(content):
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def upload_wiki_page_if_changed(session, api_url, page_title, content, force=False):
+    """
+    Upload a wiki page unless it was last uploaded with the same content.
+
+    The page cache only records what this machine uploaded, so edits made on
+    the wiki or published from elsewhere are not seen; use force to re-upload.
+
+    Args:
+        session (requests.Session): The authenticated session for MediaWiki API.
+        api_url (str): The API endpoint URL for the MediaWiki instance.
+        page_title (str): The title of the wiki page to upload or update.
+        content (str): The content to upload to the wiki page.
+        force (bool, optional): Upload even if the page cache says it is unchanged.
+
+    Returns:
+        dict: The response JSON from the MediaWiki API, or None if skipped.
+    """
+    key = _wiki_page_key(api_url, page_title)
+    if not force and wiki_page_cache.get(key) == _content_hash(content):
+        print(f"Wiki page {page_title} unchanged. No upload needed.")
+        return None
+    return upload_wiki_page(session, api_url, page_title, content)
 
 
 def generate_qr_code(tool_number, base_url=None):
@@ -777,36 +1090,52 @@ def generate_qr_code(tool_number, base_url=None):
     qr_file_name = os.path.join(
         config["file_paths"]["qr_images_location"], f"tool_{tool_number}_qr.png"
     )
+    # Sidecar recording what the PNG encodes, so unchanged codes skip encoding
+    qr_source_file = qr_file_name[: -len(".png")] + ".url"
+    qr_source = f"{qr_data}\n{QR_CODE_OPTIONS}"
+
+    if os.path.exists(qr_file_name):
+        try:
+            with open(qr_source_file, "r") as source_file:
+                if source_file.read() == qr_source:
+                    print(
+                        f"QR code for tool {tool_number} has not changed, skipping regeneration."
+                    )
+                    return qr_file_name
+        except OSError:
+            pass  # No sidecar yet; fall back to comparing the encoded image
 
     # Generate the QR code
     qr = qrcode.QRCode(
         version=None,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=2,
+        error_correction=QR_CODE_OPTIONS["error_correction"],
+        box_size=QR_CODE_OPTIONS["box_size"],
+        border=QR_CODE_OPTIONS["border"],
     )
     qr.add_data(qr_data)
     qr.make(fit=True)
     new_img = qr.make_image(fill_color="black", back_color="white")
-    temp_buffer = BytesIO()
-    new_img.save(temp_buffer, format="PNG")
-    temp_buffer.seek(0)
-    new_data = temp_buffer.read()
 
-    # Check if the file exists and compare its content
     if os.path.exists(qr_file_name):
-        with open(qr_file_name, "rb") as existing_file:
-            existing_data = existing_file.read()
-        if existing_data == new_data:
+        # Encode next to the existing file and only swap it in if it differs,
+        # so an unchanged QR code is left untouched
+        tmp_file_name = qr_file_name + ".tmp"
+        new_img.save(tmp_file_name, format="PNG")
+        if filecmp.cmp(tmp_file_name, qr_file_name, shallow=False):
+            os.remove(tmp_file_name)
             print(
                 f"QR code for tool {tool_number} has not changed, skipping regeneration."
             )
-            return qr_file_name
+        else:
+            os.replace(tmp_file_name, qr_file_name)
+            print(f"QR code saved as {qr_file_name}")
+    else:
+        # Save the new QR code
+        new_img.save(qr_file_name, format="PNG")
+        print(f"QR code saved as {qr_file_name}")
 
-    # Save the new QR code
-    with open(qr_file_name, "wb") as file:
-        file.write(new_data)
-    print(f"QR code saved as {qr_file_name}")
+    with open(qr_source_file, "w") as source_file:
+        source_file.write(qr_source)
     return qr_file_name
 
 
@@ -827,23 +1156,6 @@ def delete_wiki_item(session, api_url, title, is_media=False):
         dict: The response JSON from the MediaWiki API.
     """
     try:
-        # Fetch edit token
-        token_response = session.get(
-            api_url, params={"action": "query", "meta": "tokens", "format": "json"}
-        )
-        token_response.raise_for_status()  # Raise an error for HTTP issues
-        edit_token = (
-            token_response.json()
-            .get("query", {})
-            .get("tokens", {})
-            .get("csrftoken", None)
-        )
-
-        if not edit_token:
-            raise ValueError(
-                "Failed to retrieve CSRF token for deleting the wiki item."
-            )
-
         # Prepare the title for deletion
         if is_media:
             title = f"File:{title}"
@@ -852,10 +1164,9 @@ def delete_wiki_item(session, api_url, title, is_media=False):
         delete_params = {
             "action": "delete",
             "title": title,
-            "token": edit_token,
             "format": "json",
         }
-        response = session.post(api_url, data=delete_params)
+        response = post_with_csrf_token(session, api_url, delete_params)
         response.raise_for_status()  # Raise an error for HTTP issues
         response_data = response.json()
 
@@ -864,6 +1175,9 @@ def delete_wiki_item(session, api_url, title, is_media=False):
             error_message = response_data["error"].get("info", "Unknown error")
             raise ValueError(f"Failed to delete '{title}': {error_message}")
 
+        # A re-created page must be uploaded again even if its content matches
+        wiki_page_cache.pop(_wiki_page_key(api_url, title))
+
         return response_data
 
     except requests.exceptions.RequestException as http_err:
@@ -889,29 +1203,19 @@ def protect_wiki_page(session, api_url, page_title):
     Returns:
         dict: The response JSON from the MediaWiki API.
     """
-    # Fetch edit token
-    token_response = session.get(
-        api_url, params={"action": "query", "meta": "tokens", "format": "json"}
-    )
-    edit_token = token_response.json()["query"]["tokens"]["csrftoken"]
-
     # Set protection parameters
     protection_params = {
         "action": "protect",
         "title": page_title,
-        "token": edit_token,
         "protections": "edit=sysop|move=sysop",  # Only sysops can edit/move
         "format": "json",
     }
-    response = session.post(api_url, data=protection_params)
+    response = post_with_csrf_token(session, api_url, protection_params)
     return response.json()
 
 
-def generate_wiki_page(tool_data):
-    """
-    Generate wiki page content for a tool using the provided data.
-    """
-    template = """
+# Wiki page layout; bracketed names are filled in by generate_wiki_page()
+WIKI_PAGE_TEMPLATE = """
 [[Nibblerbot/tools|Back to Tool Library]]
 ==Tool [ToolNumber] - [ToolName]==
 {| class="wikitable"
@@ -958,8 +1262,17 @@ def generate_wiki_page(tool_data):
 ==Additional Notes==
 [AdditionalNotes]"""
 
+# The template split around its placeholders once, so each page is built with a
+# single join: literal text sits at even indexes, placeholder names at odd ones
+_WIKI_PAGE_PARTS = tuple(_PLACEHOLDER_RE.split(WIKI_PAGE_TEMPLATE))
+
+
+def generate_wiki_page(tool_data):
+    """
+    Generate wiki page content for a tool using the provided data.
+    """
     # Parse ShapeParameter from tool_data
-    shape_parameters = json.loads(tool_data.get("ShapeParameter", "{}") or "{}")
+    shape_parameters = json_column(tool_data, "ShapeParameter")
 
     # Add CornerRadius if present and format it
     corner_radius = shape_parameters.get("CornerRadius")
@@ -1028,13 +1341,13 @@ def generate_wiki_page(tool_data):
         "ToolImageFileName",
     ]
 
-    page_content = template
-
-    # Replace placeholders in the template
-    page_content = page_content.replace("[INSERT_CORNERRADIUS]", corner_radius_row)
-    page_content = page_content.replace("[INSERT_CUTTINGRADIUS]", cutting_radius_row)
-    page_content = page_content.replace("[INSERT_TAPERANGLE]", taper_angle_row)
-    page_content = page_content.replace("[INSERT_TAPERDIAMETER]", taper_diameter_row)
+    # Values for every placeholder, substituted into the template in one pass
+    substitutions = {
+        "INSERT_CORNERRADIUS": corner_radius_row,
+        "INSERT_CUTTINGRADIUS": cutting_radius_row,
+        "INSERT_TAPERANGLE": taper_angle_row,
+        "INSERT_TAPERDIAMETER": taper_diameter_row,
+    }
 
     for field in placeholders:
         value = tool_data.get(field, None)  # Access value using dictionary key
@@ -1062,10 +1375,80 @@ def generate_wiki_page(tool_data):
         else:
             formatted_value = str(value) if value else "N/A"
 
-        # Replace the placeholder in the page content
-        page_content = page_content.replace(f"[{field}]", formatted_value)
+        substitutions[field] = formatted_value
 
-    return page_content
+    # Unknown bracketed names, e.g. wiki link syntax, are left untouched
+    parts = list(_WIKI_PAGE_PARTS)
+    for i in range(1, len(parts), 2):
+        parts[i] = substitutions.get(parts[i], f"[{parts[i]}]")
+    return "".join(parts)
+
+
+def publish_tool(
+    session,
+    api_url,
+    tool,
+    columns,
+    version_bits_dirs,
+    subtype_lookup,
+    shape_cache,
+    available_images=frozenset(),
+    force=False,
+):
+    """
+    Publish a single tool: JSON files, wiki page, image and QR code.
+
+    Args:
+        session (requests.Session): The authenticated session for MediaWiki API.
+        api_url (str): The API endpoint URL for the MediaWiki instance.
+        tool (dict): The tool's row from the database.
+        columns (list): Column names corresponding to the tool data.
+        version_bits_dirs (list): (version, bits_dir) pairs to write JSON files to.
+        subtype_lookup (dict): Subtype lookup passed through to map_tool_to_json.
+        shape_cache (dict): Shape cache passed through to map_tool_to_json.
+        available_images (set): File names found in the bit images directory.
+        force (bool, optional): Re-upload the wiki page even if it looks unchanged.
+
+    Returns:
+        None
+    """
+    # Parse the JSON columns once for every version's file and the wiki page
+    tool = {
+        **tool,
+        "ShapeParameter": json_column(tool, "ShapeParameter"),
+        "ShapeAttribute": json_column(tool, "ShapeAttribute"),
+    }
+
+    # Generate JSON files for all configured FreeCAD versions
+    for version, bits_dir in version_bits_dirs:
+        generate_json_files(
+            [tool],
+            columns,
+            bits_dir,
+            version,
+            subtype_lookup=subtype_lookup,
+            shape_cache=shape_cache,
+        )
+
+    # Publish tool to the wiki
+    tool_number = tool["ToolNumber"]
+    wiki_content = generate_wiki_page(tool)
+    page_title = f"{config['wiki_settings']['index_page']}/{config['wiki_settings']['page_prefix']}_{tool_number}"
+    upload_wiki_page_if_changed(session, api_url, page_title, wiki_content, force=force)
+
+    # Handle image upload if needed
+    image_file_name = tool.get("ToolImageFileName") or f"tool_{tool_number}.png"
+    image_file_path = os.path.join(config["file_paths"]["bit_images"], image_file_name)
+
+    # Names missing from the directory listing are still checked on disk, in
+    # case of subdirectories or a case-insensitive filesystem
+    if image_file_name in available_images or os.path.exists(image_file_path):
+        upload_image_if_changed(
+            session, api_url, image_file_path, image_file_name, tool_number
+        )
+
+    # Generate QR code
+    generate_qr_code(tool_number)
 
 
 def main(
@@ -1074,6 +1457,8 @@ def main(
     progress_callback=None,
     subtype_lookup=None,
     shape_cache=None,
+    tool_numbers=None,
+    force=False,
 ):
     """
     Main function to handle publishing tools to the wiki with optional progress updates.
@@ -1088,6 +1473,10 @@ def main(
                                      processes all tools.
         progress_callback (function, optional): A callback function to update progress.
                                                 Accepts an integer progress value (0-100).
+        tool_numbers (list[int], optional): Several tool numbers to process, e.g.
+                                            only the tools that changed.
+        force (bool, optional): Re-upload every wiki page, ignoring the local
+                                page cache.
 
     Returns:
         dict: A dictionary containing the status of the operation and any messages.
@@ -1115,60 +1504,84 @@ def main(
     # Fetch tool numbers once — shared by generate_index_page_content and generate_tools_json
     cached_tool_numbers = fetch_tool_numbers_and_details()
 
+    if tool_number is not None:
+        tool_numbers = [tool_number]
+
     # try:
-    if tool_number is None:
+    if tool_numbers is None:
         # Process all tools
         tool_data, columns = fetch_tool_data()
     else:
-        # Process a specific tool
-        tool_data, columns = fetch_tool_data(tool_number=tool_number)
+        # Process only the requested tools, fetching each one on its own
+        tool_data, columns = [], []
+        for number in tool_numbers:
+            rows, columns = fetch_tool_data(tool_number=number)
+            tool_data.extend(rows)
+
+    # Output directory of every configured version, resolved once for all tools.
+    # Created up front so the publishing threads never race to create them
+    version_bits_dirs = [
+        (version, get_version_paths(version)["bits_dir"]) for version in versions
+    ]
+    for _, bits_dir in version_bits_dirs:
+        os.makedirs(bits_dir, exist_ok=True)
 
+    # List the bit images once instead of checking each tool's image on disk
+    try:
+        with os.scandir(config["file_paths"]["bit_images"]) as entries:
+            available_images = {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        available_images = set()
+
+    # Tools are independent and publishing is mostly waiting on the wiki, so
+    # they run on a thread pool; progress is reported from this thread only
+    # because the GUI callback touches Qt widgets
     total_tools = len(tool_data)
-    for idx, tool in enumerate(tool_data):
-        # Calculate and send progress (wiki publishing is 90%, file generation adds on top)
-        if progress_callback:
-            percentage = int(
-                (idx + 1) / total_tools * 80
-            )  # Reserve 20% for other tasks
-            progress_callback(percentage)
-
-        # Generate JSON files for all configured FreeCAD versions
-        for version in versions:
-            paths = get_version_paths(version)
-            generate_json_files(
-                [tool],
+    workers = config["wiki_settings"].get("publish_workers", 8)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                publish_tool,
+                session,
+                api_url,
+                tool,
                 columns,
-                paths["bits_dir"],
-                version,
-                subtype_lookup=subtype_lookup,
-                shape_cache=shape_cache,
-            )
-
-        # Publish tool to the wiki
-        tool_number = tool["ToolNumber"]
-        wiki_content = generate_wiki_page(tool)
-        page_title = f"{config['wiki_settings']['index_page']}/{config['wiki_settings']['page_prefix']}_{tool_number}"
-        upload_response = upload_wiki_page(session, api_url, page_title, wiki_content)
-
-        # Handle image upload if needed
-        image_file_name = tool.get("ToolImageFileName") or f"tool_{tool_number}.png"
-        image_file_path = os.path.join(
-            config["file_paths"]["bit_images"], image_file_name
-        )
-
-        if os.path.exists(image_file_path):
-            upload_image_if_changed(
-                session, api_url, image_file_path, image_file_name, tool_number
+                version_bits_dirs,
+                subtype_lookup,
+                shape_cache,
+                available_images,
+                force,
             )
-
-        # Generate QR code
-        generate_qr_code(tool_number)
+            for tool in tool_data
+        ]
+        last_progress = None
+        for idx, future in enumerate(as_completed(futures)):
+            try:
+                future.result()  # Re-raise any publishing error here
+            except Exception:
+                # Stop at the first failure like the old sequential loop did,
+                # instead of running every queued tool into the same error
+                executor.shutdown(cancel_futures=True)
+                raise
+            # Calculate and send progress (wiki publishing is 80%, the rest is
+            # the index page, library files and tool table). Only changes are
+            # sent, so large libraries don't repaint the GUI once per tool
+            progress = int((idx + 1) / total_tools * 80)
+            if progress_callback and progress != last_progress:
+                progress_callback(progress)
+                last_progress = progress
+    image_stat_cache.save()
 
     # Update the index page (reuse already-fetched tool numbers)
     index_page_content = generate_index_page_content(tool_numbers=cached_tool_numbers)
-    upload_wiki_page(
-        session, api_url, config["wiki_settings"]["index_page"], index_page_content
+    upload_wiki_page_if_changed(
+        session,
+        api_url,
+        config["wiki_settings"]["index_page"],
+        index_page_content,
+        force=force,
     )
+    wiki_page_cache.save()
 
     # Generate consolidated JSON library files (reuse already-fetched tool numbers)
     for version in versions:
@@ -1188,7 +1601,11 @@ def main(
     source_dir = os.path.abspath(base_dir)
 
     try:
-        generate_manifest_main(source_dir, manifest_path)
+        generate_manifest_main(
+            source_dir,
+            manifest_path,
+            pretty=config.get("manifest_settings", {}).get("pretty", False),
+        )
         print(f"Manifest updated at {manifest_path}")
     except Exception as e:
         print(f"Failed to update manifest: {e}")
@@ -1222,14 +1639,12 @@ def generate_tool_table():
     Returns:
         list: List of formatted tool table lines
     """
-    # Fetch all tools
-    tools, columns = fetch_tool_data()
-
     # Get machine max RPM from config
     machine_max_rpm = config.get("machine_settings", {}).get("max_rpm", 24000)
 
     lines = []
-    for tool in tools:
+    # Stream all tools instead of loading the whole table up front
+    for tool in iter_tool_data():
         tool_number = tool.get("ToolNumber")
         tool_name = tool.get("ToolName", "Unnamed Tool")
 
@@ -1266,14 +1681,42 @@ def generate_tool_table():
     return lines
 
 
+def parse_tool_numbers(value):
+    """
+    Parse a comma-separated list of tool numbers, e.g. "101,102,103".
+
+    Args:
+        value (str): The command-line value to parse.
+
+    Returns:
+        list[int]: The tool numbers, in the order given.
+    """
+    try:
+        tool_numbers = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid tool number list: {value!r}")
+    if not tool_numbers:
+        raise argparse.ArgumentTypeError("no tool numbers given")
+    return tool_numbers
+
+
 if __name__ == "__main__":
     # Standalone execution
-    input_val = input(
-        "Enter the tool number or press Enter to process all tools: "
-    ).strip()
-    tool_number = int(input_val) if input_val else None
+    parser = argparse.ArgumentParser(description="Publish tools to the wiki.")
+    parser.add_argument(
+        "--tools",
+        type=parse_tool_numbers,
+        metavar="N,M,K",
+        help="Comma-separated tool numbers to publish (default: all tools)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-upload every wiki page, ignoring the local page cache",
+    )
+    args = parser.parse_args()
 
-    result = main(tool_number=tool_number)
+    result = main(tool_numbers=args.tools, force=args.force)
 
     if result["status"] == "success":
         print("Publishing completed successfully!")
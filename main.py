@@ -43,6 +43,7 @@ from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 import json
+import time
 from datetime import datetime
 
 
@@ -109,16 +110,21 @@ async def hmac_validation_middleware(request: Request, call_next):
                 status_code=403, content={"detail": "Missing timestamp or nonce"}
             )
 
+        # Clients send time.time_ns() (an int in JSON bodies, digits in query
+        # strings); older clients send an ISO 8601 UTC timestamp
         try:
-            request_time = datetime.fromisoformat(timestamp)
-        except ValueError:
+            if str(timestamp).isdigit():
+                time_difference = abs(time.time_ns() - int(timestamp)) / 1e9
+            else:
+                request_time = datetime.fromisoformat(timestamp)
+                current_time = datetime.utcnow()
+                time_difference = abs((current_time - request_time).total_seconds())
+        except (TypeError, ValueError):
             print("[ERROR] Invalid timestamp format")
             return JSONResponse(
                 status_code=403, content={"detail": "Invalid timestamp format"}
             )
 
-        current_time = datetime.utcnow()
-        time_difference = abs((current_time - request_time).total_seconds())
         if time_difference > TIME_WINDOW_SECONDS:
             print(f"[ERROR] Timestamp outside valid time window: {time_difference}s")
             return JSONResponse(
@@ -176,8 +182,13 @@ async def hmac_validation_middleware(request: Request, call_next):
         )
 
 
+# The db_utils helpers are blocking; endpoints that call them are plain `def` so
+# FastAPI runs them in its threadpool instead of stalling the event loop, and
+# concurrent requests each get their own pooled connection.
+
+
 @app.delete("/delete/{table}/{id}")
-async def api_delete(table: str, id: int):
+def api_delete(table: str, id: int):
     try:
         result = delete(id)
         return {"status": "success", "result": result}
@@ -186,7 +197,7 @@ async def api_delete(table: str, id: int):
 
 
 @app.get("/column_names/{table}")
-async def api_fetch_column_names(table: str):
+def api_fetch_column_names(table: str):
     try:
         result = fetch_column_names(table)
         return {"column_names": result}
@@ -195,7 +206,7 @@ async def api_fetch_column_names(table: str):
 
 
 @app.get("/image_hash/{tool_id}")
-async def api_fetch_image_hash(tool_id: int):
+def api_fetch_image_hash(tool_id: int):
     try:
         result = fetch_image_hash(tool_id)
         return {"image_hash": result}
@@ -204,7 +215,7 @@ async def api_fetch_image_hash(tool_id: int):
 
 
 @app.get("/shapes")
-async def api_fetch_shapes(
+def api_fetch_shapes(
     shape_name: Optional[str] = None, shape_type: Optional[str] = None
 ):
     """
@@ -229,7 +240,7 @@ async def api_fetch_shapes(
 
 
 @app.get("/startup_shape_data")
-async def api_startup_shape_data():
+def api_startup_shape_data():
     """
     Return shapes_with_subtypes and shape_cache in a single response.
     Replaces separate /shapes_with_subtypes + /all_shapes_data calls at startup.
@@ -254,7 +265,7 @@ async def api_startup_shape_data():
 
 
 @app.get("/shape_subtypes")
-async def api_fetch_shape_subtypes(shape_type: Optional[str] = None):
+def api_fetch_shape_subtypes(shape_type: Optional[str] = None):
     """
     API endpoint to fetch subtypes for a given shape type.
 
@@ -272,7 +283,7 @@ async def api_fetch_shape_subtypes(shape_type: Optional[str] = None):
 
 
 @app.get("/shapes_with_subtypes")
-async def api_fetch_shapes_with_subtypes():
+def api_fetch_shapes_with_subtypes():
     """
     API endpoint to fetch all shapes with their subtypes in a hierarchical structure.
 
@@ -311,7 +322,7 @@ async def api_resolve_shape(shape_value: str, subclass: str = None):
 
 
 @app.get("/tool_data")
-async def get_tool_data(tool_number: Optional[int] = None):
+def get_tool_data(tool_number: Optional[int] = None):
     """
     Fetch tool data. If no tool_number is provided, fetch all tools.
 
@@ -335,16 +346,16 @@ async def get_tool_data(tool_number: Optional[int] = None):
 
 
 @app.get("/filtered")
-async def api_fetch_filtered(keyword: str):
+def api_fetch_filtered(keyword: str, prefix: bool = False):
     try:
-        tools, columns = fetch_filtered(keyword)
+        tools, columns = fetch_filtered(keyword, prefix=prefix)
         return {"tools": tools, "columns": columns}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/tool_numbers_and_details")
-async def api_fetch_tool_numbers_and_details():
+def api_fetch_tool_numbers_and_details():
     try:
         result = fetch_tool_numbers_and_details()
         return {"tool_numbers_and_details": result}
@@ -353,7 +364,7 @@ async def api_fetch_tool_numbers_and_details():
 
 
 @app.get("/unique_column_values/{table}/{column}")
-async def api_fetch_unique_column_values(table: str, column: str):
+def api_fetch_unique_column_values(table: str, column: str):
     try:
         result = fetch_unique_column_values(column)
         return {"unique_values": result}
@@ -362,7 +373,7 @@ async def api_fetch_unique_column_values(table: str, column: str):
 
 
 @app.post("/insert/{table}")
-async def api_insert(table: str, data: dict):
+def api_insert(table: str, data: dict):
     try:
         result = insert(data)
         return {"status": "success", "result": result}
@@ -371,7 +382,7 @@ async def api_insert(table: str, data: dict):
 
 
 @app.put("/update/{table}/{id}")
-async def api_update(table: str, id: int, data: dict):
+def api_update(table: str, id: int, data: dict):
     try:
         result = update(id, data)
         return {"status": "success", "result": result}
@@ -380,7 +391,7 @@ async def api_update(table: str, id: int, data: dict):
 
 
 @app.put("/update_image_hash/{tool_id}")
-async def api_update_image_hash(tool_id: int, data: dict):
+def api_update_image_hash(tool_id: int, data: dict):
     try:
         image_hash = data.get("image_hash")
         if not image_hash:
@@ -1,12 +1,19 @@
 import yaml
 import os
+from functools import lru_cache
+
+# libyaml's C parser when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 CONFIG_FILE = "config.yaml"
 
 
+@lru_cache(maxsize=None)
 def load_config(config_file=CONFIG_FILE):
     """
     Load the YAML configuration file.
+    The file is parsed once per path; later calls return the same dictionary,
+    so callers must treat it as read-only.
     :param config_file: Path to the YAML file.
     :return: Dictionary containing the configuration.
     """
@@ -14,7 +21,7 @@ def load_config(config_file=CONFIG_FILE):
         raise FileNotFoundError(f"Configuration file not found: {config_file}")
 
     with open(config_file, "r") as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=YAML_LOADER)
     return config
 
 
@@ -30,6 +30,7 @@ from gentoolwiki import (
     upload_wiki_page,
     generate_tools_json,
     map_column_names,
+    wiki_page_cache,
 )
 
 from db_utils import *
@@ -51,6 +52,14 @@ DB_MODE = config.get("api", {}).get("mode", "direct")
 
 set_db_mode(DB_MODE, API_URL)
 
+# Field formatting patterns, compiled once rather than on every formatted value
+# Boundary before each capital letter, e.g. "ToolDiameter" -> "Tool Diameter"
+_CAPITAL_BOUNDARY_RE = re.compile(r"(?<!^)(?=[A-Z])")
+# Dimension such as "1/4 in", "1-1/2\"" or "6mm": (number, unit)
+_DIMENSION_RE = re.compile(r"([\d\s./-]+)([a-zA-Z\"']*)")
+_NON_DECIMAL_RE = re.compile(r"[^\d.]")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
 
 class FilterableComboBox(QComboBox):
     def __init__(self, get_items_callback, parent=None):
@@ -772,7 +781,7 @@ class ToolDatabaseGUI(QMainWindow):
         """
         # Insert a space before each uppercase letter followed by a lowercase letter
         # or between two uppercase letters followed by a lowercase
-        human_readable = re.sub(r"(?<!^)(?=[A-Z])", " ", value)
+        human_readable = _CAPITAL_BOUNDARY_RE.sub(" ", value)
         # Capitalize the first letter of each word
         return human_readable.strip().title()
 
@@ -974,7 +983,7 @@ class ToolDatabaseGUI(QMainWindow):
                 if not value or value.strip().upper() == "N/A":
                     return "N/A"
 
-                match = re.match(r"([\d\s./-]+)([a-zA-Z\"']*)", value.strip())
+                match = _DIMENSION_RE.match(value.strip())
                 if match:
                     number_str, unit = match.groups()
 
@@ -1011,9 +1020,8 @@ class ToolDatabaseGUI(QMainWindow):
             elif field_type == "angle":
                 # Format angle fields with configurable precision
                 angle_precision = config["tool_settings"].get("angle_precision", 4)
-                number = re.sub(
-                    r"[^\d.]", "", value
-                )  # Remove all non-digit and non-decimal characters
+                # Remove all non-digit and non-decimal characters
+                number = _NON_DECIMAL_RE.sub("", value)
                 if number:  # Ensure there is something to convert
                     return f"{float(number):.{angle_precision}f}°"  # Apply precision
                 else:
@@ -1023,7 +1031,7 @@ class ToolDatabaseGUI(QMainWindow):
                 # Format RPM fields
                 if value == "-1":
                     return "-1"  # Allow -1 as a valid value
-                number = re.sub(r"[^\d]", "", value)  # Remove all non-digit characters
+                number = _NON_DIGIT_RE.sub("", value)  # Remove all non-digit characters
                 if number:  # Ensure there is something to convert
                     number = int(number)  # Convert the cleaned value to an integer
                     return f"{number:,}"  # Format with commas
@@ -1031,7 +1039,7 @@ class ToolDatabaseGUI(QMainWindow):
                     return ""  # Clear the field if it contains no valid number
 
             elif field_type == "number":
-                return re.sub(r"[^\d]", "", value)
+                return _NON_DIGIT_RE.sub("", value)
 
             return value  # Default return if no formatting applied
 
@@ -1802,6 +1810,9 @@ class ToolDatabaseGUI(QMainWindow):
                             self, "Error", f"Failed to update the index page: {str(e)}"
                         )
 
+                    # Persist the page hashes changed by the edits above
+                    wiki_page_cache.save()
+
                     progress.setValue(4)
                     QApplication.processEvents()
                 QMessageBox.information(